@@ -0,0 +1,250 @@
+"""
+Analytics Module
+Aggregation-backed summary statistics computed inside MongoDB
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+from datetime import datetime, timedelta
+from database import working_hours_col, employees_col, attendance_col
+
+# Minimum hours for a day to count as present
+MIN_DAILY_HOURS = 6
+
+# Check-ins later than this many minutes after midnight (09:30) are late arrivals
+LATE_AFTER_MINUTES = 9 * 60 + 30
+
+EMPTY_HOURS_STATS = {
+    "total_hours": 0.0,
+    "avg_hours": 0.0,
+    "days": 0,
+    "checked_out": 0,
+    "below_min": 0
+}
+
+
+def _hours_stats_pipeline(employee_ids: list, start_dt, end_dt, group_key) -> list:
+    """Build the $match/$group pipeline shared by the working-hours stats"""
+    match = {"employee_id": {"$in": list(employee_ids)}}
+    date_range = {}
+    if start_dt is not None:
+        date_range["$gte"] = start_dt
+    if end_dt is not None:
+        date_range["$lte"] = end_dt
+    if date_range:
+        match["date"] = date_range
+
+    hours = {"$ifNull": ["$working_hours", 0]}
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": group_key,
+            "total_hours": {"$sum": hours},
+            "avg_hours": {"$avg": hours},
+            "days": {"$sum": 1},
+            "checked_out": {"$sum": {"$cond": [{"$eq": ["$status", "checked_out"]}, 1, 0]}},
+            "below_min": {"$sum": {"$cond": [{"$lt": [hours, MIN_DAILY_HOURS]}, 1, 0]}}
+        }}
+    ]
+
+
+def working_hours_stats_by_employee(employee_ids: list, start_dt=None, end_dt=None) -> dict:
+    """
+    Summarise working hours per employee over a date range
+
+    Returns:
+        {employee_id: stats dict} for employees that have records
+    """
+    if not employee_ids:
+        return {}
+
+    pipeline = _hours_stats_pipeline(employee_ids, start_dt, end_dt, "$employee_id")
+    pipeline.append({"$sort": {"_id": 1}})
+
+    stats = {}
+    for row in working_hours_col.aggregate(pipeline):
+        stats[row.pop("_id")] = row
+    return stats
+
+
+def summarize_hours_records(records: list) -> dict:
+    """
+    Per-employee working hours stats from already fetched working_hours rows
+
+    Same fields as working_hours_stats_by_employee, for pages that already
+    hold every row of the range and need no second round trip.
+
+    Returns:
+        {employee_id: stats dict}, ordered by employee_id
+    """
+    stats = {}
+    for record in sorted(records, key=lambda r: r["employee_id"]):
+        hours = record.get("working_hours") or 0
+        row = stats.setdefault(record["employee_id"], {**EMPTY_HOURS_STATS})
+        row["total_hours"] += hours
+        row["days"] += 1
+        row["checked_out"] += record.get("status") == "checked_out"
+        row["below_min"] += hours < MIN_DAILY_HOURS
+    for row in stats.values():
+        row["avg_hours"] = row["total_hours"] / row["days"]
+    return stats
+
+
+def punctuality_by_department(start_dt: datetime, end_dt: datetime, employee_ids: list = None) -> list:
+    """
+    Late arrivals and average start time per department over a date range
+
+    Present attendance days are reduced to per-employee totals first, so the
+    department $lookup runs once per employee rather than once per day.
+
+    Args:
+        start_dt / end_dt: Inclusive attendance date range
+        employee_ids: Restrict to these employees (None for everyone)
+
+    Returns:
+        List of dicts with department, employees, days, late, late_pct and
+        avg_start_minutes (minutes after midnight), sorted by department
+    """
+    match = {
+        "date": {"$gte": start_dt, "$lte": end_dt},
+        "status": "present",
+        "check_in": {"$type": "date"}
+    }
+    if employee_ids is not None:
+        match["employee_id"] = {"$in": list(employee_ids)}
+
+    start_minutes = {"$divide": [{"$subtract": ["$check_in", "$date"]}, 60000]}
+    pipeline = [
+        {"$match": match},
+        {"$group": {
+            "_id": "$employee_id",
+            "days": {"$sum": 1},
+            "late": {"$sum": {"$cond": [{"$gt": [start_minutes, LATE_AFTER_MINUTES]}, 1, 0]}},
+            "start_minutes": {"$sum": start_minutes}
+        }},
+        {"$lookup": {
+            "from": "employees",
+            "let": {"employee_id": "$_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$employee_id", "$$employee_id"]}}},
+                {"$project": {"_id": 0, "department": 1}},
+                {"$limit": 1}
+            ],
+            "as": "employee"
+        }},
+        {"$group": {
+            "_id": {"$ifNull": [{"$arrayElemAt": ["$employee.department", 0]}, "-"]},
+            "employees": {"$sum": 1},
+            "days": {"$sum": "$days"},
+            "late": {"$sum": "$late"},
+            "start_minutes": {"$sum": "$start_minutes"}
+        }},
+        {"$project": {
+            "_id": 0,
+            "department": "$_id",
+            "employees": 1,
+            "days": 1,
+            "late": 1,
+            "late_pct": {"$round": [{"$multiply": [{"$divide": ["$late", "$days"]}, 100]}, 1]},
+            "avg_start_minutes": {"$round": [{"$divide": ["$start_minutes", "$days"]}, 0]}
+        }},
+        {"$sort": {"department": 1}}
+    ]
+    return list(attendance_col.aggregate(pipeline))
+
+
+def employee_overview(employee_id: str, today: datetime, fields: dict = None):
+    """
+    Load an employee profile and its dashboard metrics in one aggregation
+
+    Args:
+        employee_id: Employee ID
+        today: Today's date at midnight
+        fields: Projection for the returned employee document (whole document if None)
+
+    Returns:
+        dict with employee, today_status, today_hours, week_hours,
+        month_hours and pending_leaves, or None if the employee is missing
+    """
+    week_start = today - timedelta(days=today.weekday())
+    month_start = today.replace(day=1)
+    hours = {"$ifNull": ["$working_hours", 0]}
+
+    pipeline = [
+        {"$match": {"employee_id": employee_id}},
+        {"$limit": 1}
+    ]
+    if fields:
+        pipeline.append({"$project": fields})
+    pipeline += [
+        {"$lookup": {
+            "from": "attendance",
+            "pipeline": [
+                {"$match": {"employee_id": employee_id, "date": today}},
+                {"$project": {"_id": 0, "status": 1}},
+                {"$limit": 1}
+            ],
+            "as": "today_attendance"
+        }},
+        {"$lookup": {
+            "from": "working_hours",
+            "pipeline": [
+                {"$match": {"employee_id": employee_id, "date": {"$gte": min(week_start, month_start)}}},
+                {"$facet": {
+                    "today": [
+                        {"$match": {"date": today}},
+                        {"$project": {"_id": 0, "check_in": 1, "check_out": 1, "working_hours": 1}},
+                        {"$limit": 1}
+                    ],
+                    "week": [
+                        {"$match": {"date": {"$gte": week_start}}},
+                        {"$group": {"_id": None, "total": {"$sum": hours}}}
+                    ],
+                    "month": [
+                        {"$match": {"date": {"$gte": month_start}}},
+                        {"$group": {"_id": None, "total": {"$sum": hours}}}
+                    ]
+                }}
+            ],
+            "as": "hours"
+        }},
+        {"$lookup": {
+            "from": "leave_requests",
+            "pipeline": [
+                {"$match": {"employee_id": employee_id, "status": "pending"}},
+                {"$count": "count"}
+            ],
+            "as": "pending"
+        }}
+    ]
+
+    doc = next(employees_col.aggregate(pipeline), None)
+    if not doc:
+        return None
+
+    today_attendance = doc.pop("today_attendance")
+    hours_facets = doc.pop("hours")[0]
+    pending = doc.pop("pending")
+
+    today_status = today_attendance[0].get("status", "Unknown").upper() if today_attendance else "Not Marked"
+
+    today_hours = 0
+    if hours_facets["today"]:
+        today_record = hours_facets["today"][0]
+        today_hours = today_record.get("working_hours", 0)
+        check_in = today_record.get("check_in")
+        if check_in and not today_record.get("check_out"):
+            # Currently checked in - calculate live hours
+            today_hours = (datetime.now() - check_in).total_seconds() / 3600
+
+    return {
+        "employee": doc,
+        "today_status": today_status,
+        "today_hours": today_hours,
+        "week_hours": hours_facets["week"][0]["total"] if hours_facets["week"] else 0,
+        "month_hours": hours_facets["month"][0]["total"] if hours_facets["month"] else 0,
+        "pending_leaves": pending[0]["count"] if pending else 0
+    }
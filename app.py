@@ -4,6 +4,7 @@ Human Resource Management System
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -11,9 +12,17 @@ from datetime import datetime
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Registers the query profiler before the MongoClient is created
+import query_profiler
+import metrics
+
 # Import page modules
 from pages import login, employee_dashboard, admin_dashboard
-from database import working_hours_col
+from analytics import MIN_DAILY_HOURS
+import attendance_service
+import session_tokens
+from migrate import check_schema
+from pymongo.errors import ConnectionFailure
 
 # Page configuration
 st.set_page_config(
@@ -43,19 +52,58 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Verify the schema version once per process (later reruns skip this)
+try:
+    check_schema()
+except Exception as e:
+    print(f"❌ MongoDB connection failed: {e}")
+
+# Prometheus endpoint (only when METRICS_PORT is set; started once per process)
+metrics.start_http_server()
+
 # Initialize session state
 if "authenticated" not in st.session_state:
     st.session_state.authenticated = False
     st.session_state.user = None
     st.session_state.user_role = None
     st.session_state.checked_in = False
+    st.session_state.session_token = None
 
-def main():
+def resume_session():
+    """Restore a returning user from the session cookie (once per browser session)"""
+    if st.session_state.authenticated or st.session_state.get("session_resume_checked"):
+        return
+    st.session_state.session_resume_checked = True
+    
+    token = st.context.cookies.get(session_tokens.COOKIE_NAME)
+    if not token:
+        return
+    
+    try:
+        user = session_tokens.resume_session(token)
+    except Exception as e:
+        print(f"❌ Session resume failed: {e}")
+        return
+    
+    if user:
+        st.session_state.user = user
+        st.session_state.authenticated = True
+        st.session_state.user_role = user.get("role")
+        st.session_state.session_token = token
+
+def render():
     """Main application logic"""
     
+    resume_session()
+    
+    # Cookie changes queued by the last login/logout ("" clears the cookie)
+    if "session_cookie" in st.session_state:
+        components.html(session_tokens.cookie_script(st.session_state.pop("session_cookie")), height=0)
+    
     # Check if user is authenticated
     if not st.session_state.authenticated:
         # Show login page
+        query_profiler.set_page("login")
         login.show()
     else:
         # User is authenticated
@@ -64,6 +112,7 @@ def main():
         employee_id = user.get("employee_id")
         
         # Sidebar
+        query_profiler.set_page("sidebar")
         with st.sidebar:
             st.markdown("# 🏢 Dayflow HRMS")
             st.markdown(f"### 👤 {user['name']}")
@@ -75,14 +124,11 @@ def main():
             if user_role == "employee":
                 st.markdown("### ⏱️ Attendance Tracker")
                 
-                # ✅ FIX: Use datetime.datetime instead of datetime.date
-                today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                today_record = None
-                if working_hours_col is not None:
-                    today_record = working_hours_col.find_one({
-                        "employee_id": employee_id,
-                        "date": today
-                    })
+                # Feedback from the previous click survives the rerun as a toast
+                for icon, message in st.session_state.pop("attendance_toasts", []):
+                    st.toast(message, icon=icon)
+                
+                today_record = attendance_service.get_today_record(employee_id)
                 
                 col1, col2 = st.columns(2)
                 
@@ -90,15 +136,8 @@ def main():
                     # Not checked in
                     with col1:
                         if st.button("✅ Check In", use_container_width=True):
-                            working_hours_col.insert_one({
-                                "employee_id": employee_id,
-                                "date": today,
-                                "check_in": datetime.now(),
-                                "check_out": None,
-                                "working_hours": 0,
-                                "status": "checked_in"
-                            })
-                            st.success("✅ Checked in successfully!")
+                            success, msg = attendance_service.check_in(employee_id)
+                            st.session_state.attendance_toasts = [("✅" if success else "⚠️", msg)]
                             st.rerun()
                 elif today_record.get("status") == "checked_in":
                     # Already checked in, show check-out
@@ -107,54 +146,22 @@ def main():
                     hours_worked = (current_time - check_in_time).total_seconds() / 3600
                     
                     st.info(f"⏱️ Worked: {hours_worked:.2f} hours")
+                    if hours_worked < MIN_DAILY_HOURS:
+                        st.caption(f"⚠️ Minimum {MIN_DAILY_HOURS} hours required. Checking out now marks you ABSENT.")
                     
                     with col1:
                         if st.button("🔴 Check Out", use_container_width=True):
-                            check_out_time = datetime.now()
-                            hours = (check_out_time - check_in_time).total_seconds() / 3600
-                            
-                            # Determine status: absent if < 6 hours, else present
-                            status = "absent" if hours < 6 else "present"
-                            
-                            # Show warning if < 6 hours
-                            if hours < 6:
-                                st.warning(f"⚠️ You've only worked {hours:.2f} hours. Minimum 6 hours required!")
-                                st.warning("❌ You will be marked ABSENT")
-                                import time
-                                time.sleep(2)
-                            
-                            # Update working hours record
-                            working_hours_col.update_one(
-                                {"_id": today_record["_id"]},
-                                {"$set": {
-                                    "check_out": check_out_time,
-                                    "working_hours": round(hours, 2),
-                                    "status": "checked_out"
-                                }}
-                            )
-                            
-                            # Update attendance record
-                            from database import attendance_col
-                            attendance_col.update_one(
-                                {
-                                    "employee_id": employee_id,
-                                    "date": today
-                                },
-                                {
-                                    "$set": {
-                                        "status": status,
-                                        "check_in": check_in_time.strftime("%H:%M %p"),
-                                        "check_out": check_out_time.strftime("%H:%M %p"),
-                                        "working_hours": round(hours, 2)
-                                    }
-                                },
-                                upsert=True
-                            )
+                            success, result = attendance_service.check_out(employee_id)
                             
-                            st.success(f"✅ Checked out! Status: {status.upper()}")
-                            st.info(f"Working hours: {hours:.2f} hrs")
-                            import time
-                            time.sleep(2)
+                            if success:
+                                toasts = [("✅", f"Checked out! Status: {result['status'].upper()}")]
+                                if result["status"] == "absent":
+                                    toasts.append(("⚠️", f"You worked {result['hours']:.2f} hours. Minimum {MIN_DAILY_HOURS} hours required!"))
+                                else:
+                                    toasts.append(("⏱️", f"Working hours: {result['hours']:.2f} hrs"))
+                            else:
+                                toasts = [("⚠️", result)]
+                            st.session_state.attendance_toasts = toasts
                             st.rerun()
                 else:
                     # Already checked out today
@@ -178,15 +185,21 @@ def main():
             
             st.markdown("---")
             
+            if user_role == "admin":
+                st.checkbox("🐞 Query profiler", key="query_debug")
+            
             # Logout button
             if st.button(
                 "🚪 Logout",
                 use_container_width=True,
                 key="logout_btn"
             ):
+                session_tokens.revoke_session(st.session_state.get("session_token"))
                 st.session_state.authenticated = False
                 st.session_state.user = None
                 st.session_state.user_role = None
+                st.session_state.session_token = None
+                st.session_state.session_cookie = ""
                 st.success("✅ Logged out successfully!")
                 st.rerun()
         
@@ -194,16 +207,33 @@ def main():
         if user_role == "admin":
             # Admin pages
             if page == "📈 Dashboard":
-                admin_dashboard.show()
+                admin_dashboard.show(initial_section="📈 Dashboard")
             elif page == "👥 Manage Users":
-                st.info("👥 Manage Users page coming soon...")
+                query_profiler.set_page("admin", page)
+                admin_dashboard.show_manage_users()
             elif page == "📋 Leave Requests":
                 admin_dashboard.show_leave_requests()
             elif page == "📊 Reports":
-                st.info("📊 Reports page coming soon...")
+                query_profiler.set_page("admin", page)
+                admin_dashboard.show_reports()
+            
+            # Debug panel: everything this rerun sent to MongoDB so far
+            if st.session_state.get("query_debug"):
+                admin_dashboard.show_query_profile(query_profiler.current())
         else:
             # Employee: Just show the dashboard (all tabs included)
             employee_dashboard.show()
 
+@metrics.timed_page("app")
+@query_profiler.profile_rerun
+def main():
+    """Render the app, reporting an unreachable database instead of a traceback"""
+    # No per-rerun ping: the first query fails after MONGO_TIMEOUT_MS if the server is down
+    try:
+        render()
+    except ConnectionFailure as e:
+        print(f"❌ MongoDB connection failed: {e}")
+        st.error("❌ Database connection failed")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+Attendance Service
+Check-in and check-out writes for working_hours and attendance
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+from database import working_hours_col, attendance_col
+from analytics import MIN_DAILY_HOURS
+import daily_summary
+import metrics
+
+# Display format for check-in/check-out times; stored values are datetimes
+TIME_FORMAT = "%I:%M %p"
+
+
+def today_start() -> datetime:
+    """Return today's date at midnight (the `date` key used by both collections)"""
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def format_time(value) -> str:
+    """Format a stored check-in/check-out time for display ("-" if missing)"""
+    if isinstance(value, datetime):
+        return value.strftime(TIME_FORMAT)
+    return value or "-"
+
+
+def get_today_record(employee_id: str):
+    """Return today's working_hours record for an employee, if any"""
+    return working_hours_col.find_one({"employee_id": employee_id, "date": today_start()})
+
+
+def check_in(employee_id: str) -> tuple:
+    """
+    Start today's working_hours record
+
+    A single $setOnInsert upsert on the unique (employee_id, date) key, so
+    double clicks, retries and a second open tab never create duplicates.
+
+    Returns:
+        (success: bool, message: str)
+    """
+    today = today_start()
+    try:
+        result = working_hours_col.update_one(
+            {"employee_id": employee_id, "date": today},
+            {"$setOnInsert": {
+                "check_in": datetime.now(),
+                "check_out": None,
+                "working_hours": 0,
+                "status": "checked_in"
+            }},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # A concurrent upsert inserted the same key first
+        return False, "⚠️ Already checked in today"
+
+    if result.upserted_id is None:
+        return False, "⚠️ Already checked in today"
+
+    daily_summary.record_check_in(today)
+    metrics.inc("check_in")
+    return True, "✅ Checked in successfully!"
+
+
+def check_out(employee_id: str) -> tuple:
+    """
+    Close today's working_hours record and mark attendance
+
+    The working_hours update is a single find_one_and_update guarded on
+    status == "checked_in", with hours computed from the stored check-in
+    time on the server. A repeated click matches nothing and changes
+    nothing; the attendance upsert that follows writes the same values
+    for the same record, so retrying it is safe.
+
+    Returns:
+        (success: bool, result: dict/str)
+        - If success: (True, {"status", "hours", "check_in", "check_out"})
+        - If failed: (False, error_message)
+    """
+    today = today_start()
+    check_out_time = datetime.now()
+
+    record = working_hours_col.find_one_and_update(
+        {"employee_id": employee_id, "date": today, "status": "checked_in"},
+        [{"$set": {
+            "check_out": check_out_time,
+            "working_hours": {"$round": [
+                {"$divide": [{"$subtract": [check_out_time, "$check_in"]}, 3600000]},
+                2
+            ]},
+            "status": "checked_out"
+        }}],
+        return_document=ReturnDocument.AFTER
+    )
+    if record is None:
+        return False, "⚠️ No open check-in found for today"
+
+    hours = record["working_hours"]
+    # Determine status: absent if below the daily minimum, else present
+    status = "absent" if hours < MIN_DAILY_HOURS else "present"
+
+    attendance_col.update_one(
+        {"employee_id": employee_id, "date": today},
+        {"$set": {
+            "status": status,
+            "check_in": record["check_in"],
+            "check_out": check_out_time,
+            "working_hours": hours
+        }},
+        upsert=True
+    )
+    daily_summary.record_check_out(today, status)
+    metrics.inc("check_out")
+
+    return True, {
+        "status": status,
+        "hours": hours,
+        "check_in": record["check_in"],
+        "check_out": check_out_time
+    }
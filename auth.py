@@ -4,21 +4,108 @@ Handles user login, signup, and password hashing
 """
 
 import bcrypt
+import os
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 from database import users_col
+import employee_directory
+import metrics
 
-def hash_password(password: str) -> bytes:
-    """Hash a password using bcrypt"""
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+# bcrypt work factor for new hashes; existing hashes are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+def hash_password(password: str, rounds: int = None) -> bytes:
+    """Hash a password using bcrypt at BCRYPT_ROUNDS (or the given cost)"""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds or BCRYPT_ROUNDS))
+
+def hash_rounds(hashed: bytes) -> int:
+    """Return the cost factor encoded in a bcrypt hash ($2b$<rounds>$...)"""
+    return int(hashed.split(b"$")[2])
+
+def needs_rehash(hashed: bytes) -> bool:
+    """Check whether a stored hash uses a different cost than BCRYPT_ROUNDS"""
+    return hash_rounds(hashed) != BCRYPT_ROUNDS
 
 def verify_password(password: str, hashed: bytes) -> bool:
     """Verify a password against its hash"""
     return bcrypt.checkpw(password.encode(), hashed)
 
+# =========================================================
+# PASSWORD WORKER POOL AND ADMISSION CONTROL
+# =========================================================
+
+# bcrypt releases the GIL, so a thread pool bounds CPU use without blocking other sessions
+AUTH_WORKERS = int(os.getenv("AUTH_WORKERS", str(os.cpu_count() or 2)))
+AUTH_MAX_PENDING = int(os.getenv("AUTH_MAX_PENDING", str(AUTH_WORKERS * 4)))
+AUTH_MAX_ATTEMPTS = int(os.getenv("AUTH_MAX_ATTEMPTS", "5"))
+AUTH_ATTEMPT_WINDOW_SECONDS = int(os.getenv("AUTH_ATTEMPT_WINDOW_SECONDS", "60"))
+
+BUSY_MESSAGE = "⏳ Server is busy, please try again in a moment"
+THROTTLED_MESSAGE = "⏳ Too many attempts for this email, please try again in a minute"
+
+_password_pool = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="bcrypt")
+_pending_slots = threading.BoundedSemaphore(AUTH_MAX_PENDING)
+
+_attempts_lock = threading.Lock()
+_attempts = {}
+
+def run_password_work(fn, *args):
+    """
+    Run bcrypt work on the shared pool
+
+    Returns:
+        (accepted: bool, result) - accepted is False when AUTH_MAX_PENDING
+        jobs are already queued or running, so the caller can fail fast
+    """
+    if not _pending_slots.acquire(blocking=False):
+        return False, None
+    try:
+        return True, _password_pool.submit(fn, *args).result()
+    finally:
+        _pending_slots.release()
+
+def normalize_email(email: str) -> str:
+    """Canonical form of an email for storage and lookup (trimmed, lowercased)"""
+    return email.strip().lower()
+
+def allow_attempt(email: str) -> bool:
+    """Record an attempt for an email; False once the window's limit is reached"""
+    now = time.monotonic()
+    cutoff = now - AUTH_ATTEMPT_WINDOW_SECONDS
+    key = normalize_email(email)
+
+    with _attempts_lock:
+        recent = _attempts.setdefault(key, deque())
+        while recent and recent[0] < cutoff:
+            recent.popleft()
+        if len(recent) >= AUTH_MAX_ATTEMPTS:
+            return False
+        recent.append(now)
+
+        # Keep the table from growing without bound
+        if len(_attempts) > 10000:
+            for stale in [k for k, v in _attempts.items() if not v or v[-1] < cutoff]:
+                del _attempts[stale]
+        return True
+
+def clear_attempts(email: str):
+    """Reset the attempt counter after a successful login"""
+    with _attempts_lock:
+        _attempts.pop(normalize_email(email), None)
+
+def _verify_and_upgrade(password: str, hashed: bytes) -> tuple:
+    """Pool job: verify, and produce a new hash if the stored cost is outdated"""
+    if not verify_password(password, hashed):
+        return False, None
+    return True, hash_password(password) if needs_rehash(hashed) else None
+
 def login_user(email: str, password: str) -> tuple:
     """
     Authenticate user login
@@ -32,22 +119,44 @@ def login_user(email: str, password: str) -> tuple:
         - If success: (True, user_dict)
         - If failed: (False, error_message)
     """
-    if users_col is None:
-        return False, "❌ Database connection failed"
+    if not allow_attempt(email):
+        metrics.inc("login_throttled")
+        return False, THROTTLED_MESSAGE
     
     try:
         # Find user by email
-        user = users_col.find_one({"email": email})
+        user = users_col.find_one({"email": normalize_email(email)})
         
         if not user:
+            metrics.inc("login_failure")
             return False, "❌ Email not found. Please signup first."
         
-        # Verify password
-        if verify_password(password, user["password"]):
+        # Verify password on the bounded worker pool
+        accepted, result = run_password_work(_verify_and_upgrade, password, user["password"])
+        if not accepted:
+            metrics.inc("login_busy")
+            return False, BUSY_MESSAGE
+        
+        valid, new_hash = result
+        if valid:
+            clear_attempts(email)
+            metrics.inc("login_success")
+            
+            # Transparently move the stored hash to the configured cost
+            if new_hash:
+                try:
+                    users_col.update_one(
+                        {"_id": user["_id"], "password": user["password"]},
+                        {"$set": {"password": new_hash}}
+                    )
+                except Exception as e:
+                    print(f"⚠️ Password rehash failed: {e}")
+            
             # Remove password from returned user object
             user.pop("password", None)
             return True, user
         else:
+            metrics.inc("login_failure")
             return False, "❌ Incorrect password"
     
     except Exception as e:
@@ -67,10 +176,9 @@ def signup_user(email: str, password: str, name: str, employee_id: str, role: st
     Returns:
         (success: bool, message: str)
     """
-    if users_col is None:
-        return False, "❌ Database connection failed"
-    
     try:
+        email = normalize_email(email)
+        
         # Check if email already exists
         existing_user = users_col.find_one({"email": email})
         if existing_user:
@@ -81,10 +189,15 @@ def signup_user(email: str, password: str, name: str, employee_id: str, role: st
         if existing_employee:
             return False, "❌ Employee ID already registered"
         
+        # Hash on the bounded worker pool
+        accepted, hashed = run_password_work(hash_password, password)
+        if not accepted:
+            return False, BUSY_MESSAGE
+        
         # Create new user
         new_user = {
             "email": email,
-            "password": hash_password(password),
+            "password": hashed,
             "name": name,
             "employee_id": employee_id,
             "role": role.lower()  # Ensure role is lowercase
@@ -93,6 +206,7 @@ def signup_user(email: str, password: str, name: str, employee_id: str, role: st
         result = users_col.insert_one(new_user)
         
         if result.inserted_id:
+            employee_directory.invalidate()
             return True, f"✅ Account created successfully as {role.upper()}!"
         else:
             return False, "❌ Failed to create account"
@@ -0,0 +1,57 @@
+"""
+bcrypt Cost Benchmark
+Reports hash/verify latency per work factor on this machine
+Usage: python bench_bcrypt.py [--min-rounds 10] [--max-rounds 14] [--iterations 5]
+"""
+
+import argparse
+import statistics
+import time
+import bcrypt
+from auth import BCRYPT_ROUNDS, hash_password, verify_password
+
+
+def bench_rounds(rounds: int, iterations: int) -> dict:
+    """
+    Time hashing and verification at one cost factor
+
+    Returns:
+        dict with median hash_ms and verify_ms
+    """
+    password = "benchmark-password"
+    hash_times = []
+    verify_times = []
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        hashed = hash_password(password, rounds)
+        hash_times.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        verify_password(password, hashed)
+        verify_times.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "hash_ms": statistics.median(hash_times),
+        "verify_ms": statistics.median(verify_times)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bcrypt latency per cost factor")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=14)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"\n🔐 bcrypt {bcrypt.__version__} - configured BCRYPT_ROUNDS={BCRYPT_ROUNDS}\n")
+    print(f"{'rounds':>6}  {'hash (ms)':>10}  {'verify (ms)':>11}  {'logins/s/core':>13}")
+
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        result = bench_rounds(rounds, args.iterations)
+        marker = "  ← current" if rounds == BCRYPT_ROUNDS else ""
+        print(
+            f"{rounds:>6}  {result['hash_ms']:>10.1f}  {result['verify_ms']:>11.1f}  "
+            f"{1000 / result['verify_ms']:>13.1f}{marker}"
+        )
+    print()
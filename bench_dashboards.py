@@ -0,0 +1,183 @@
+"""
+Dashboard Benchmark Suite
+Drives the login page, employee dashboard and admin dashboard headlessly
+with Streamlit's AppTest against a generated dataset, and records wall
+time, MongoDB command count and reply bytes for every page section
+
+Usage: python bench_dashboards.py [--sizes 100,1000] [--days 60] [--runs 3]
+                                  [--output bench_baseline.json] [--compare old.json]
+
+Requires a reachable MongoDB (MONGO_URI / --uri). The benchmark database
+(--db-name, default dayflow_bench) is wiped and regenerated for each size.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import bson
+from pymongo import monitoring
+
+APP_PATH = str(Path(__file__).parent / "app.py")
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands and reply bytes for every MongoClient created after registration"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.commands = 0
+            self.reply_bytes = 0
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        size = len(bson.encode(event.reply))
+        with self.lock:
+            self.commands += 1
+            self.reply_bytes += size
+
+    def failed(self, event):
+        with self.lock:
+            self.commands += 1
+
+
+def _measure(counter: CommandCounter, run, runs: int) -> dict:
+    """Run one page interaction `runs` times and summarise"""
+    times = []
+    commands = []
+    reply_bytes = []
+    for _ in range(runs):
+        counter.reset()
+        start = time.perf_counter()
+        at = run()
+        times.append((time.perf_counter() - start) * 1000)
+        commands.append(counter.commands)
+        reply_bytes.append(counter.reply_bytes)
+        if at.exception:
+            raise RuntimeError(f"page raised: {at.exception[0].message}")
+    return {
+        "wall_ms_median": round(statistics.median(times), 1),
+        "wall_ms_max": round(max(times), 1),
+        "commands": max(commands),
+        "reply_bytes": max(reply_bytes)
+    }
+
+
+def _app(user: dict = None):
+    """Build an AppTest for app.py, logged in as `user` if given"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    if user:
+        at.session_state.authenticated = True
+        at.session_state.user = user
+        at.session_state.user_role = user["role"]
+        at.session_state.checked_in = False
+        at.session_state.session_token = None
+    return at
+
+
+def bench_size(counter: CommandCounter, size: int, days: int, runs: int, seed: int) -> list:
+    """Generate a dataset of `size` employees and benchmark every page section"""
+    import init_db
+    from pages import admin_dashboard, employee_dashboard
+
+    init_db.generate_data(employees=size, days=days, seed=seed)
+
+    employee = {"employee_id": "EMP00001", "email": "emp00001@company.com", "name": "Bench Employee", "role": "employee"}
+    admin = {"employee_id": "ADMIN001", "email": "admin@company.com", "name": "Admin User", "role": "admin"}
+    results = []
+
+    def record(page: str, section: str, run):
+        result = _measure(counter, run, runs)
+        result.update({"employees": size, "days": days, "page": page, "section": section})
+        results.append(result)
+        print(f"  {page:<10} {section:<22} {result['wall_ms_median']:>9.1f} ms  "
+              f"{result['commands']:>5} cmds  {result['reply_bytes']:>10} B")
+
+    at = _app()
+    at.run()
+    record("login", "Login", lambda: at.run())
+
+    at = _app(employee)
+    at.run()
+    for section in employee_dashboard.SECTIONS:
+        at.radio(key="employee_section").set_value(section).run()
+        record("employee", section, lambda: at.run())
+
+    at = _app(admin)
+    at.run()
+    for section in admin_dashboard.SECTIONS:
+        at.radio(key="admin_section").set_value(section).run()
+        record("admin", section, lambda: at.run())
+
+    return results
+
+
+def compare(results: list, baseline_path: str):
+    """Print command/byte/time changes against a previous baseline file"""
+    with open(baseline_path) as f:
+        baseline = {
+            (r["employees"], r["page"], r["section"]): r
+            for r in json.load(f)["results"]
+        }
+
+    print(f"\n📊 Compared with {baseline_path}:")
+    for r in results:
+        old = baseline.get((r["employees"], r["page"], r["section"]))
+        if not old:
+            continue
+        print(f"  {r['employees']:>6} {r['page']:<10} {r['section']:<22} "
+              f"cmds {old['commands']:>4} → {r['commands']:<4} "
+              f"bytes {old['reply_bytes']:>9} → {r['reply_bytes']:<9} "
+              f"ms {old['wall_ms_median']:>8.1f} → {r['wall_ms_median']:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dashboard pages per dataset size")
+    parser.add_argument("--sizes", default="100,1000", help="comma-separated employee counts")
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--runs", type=int, default=3, help="measured reruns per section")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--uri", default=None, help="MongoDB URI (default: MONGO_URI)")
+    parser.add_argument("--db-name", default="dayflow_bench", help="database to wipe and fill")
+    parser.add_argument("--output", default="bench_baseline.json")
+    parser.add_argument("--compare", default=None, help="previous baseline JSON to diff against")
+    args = parser.parse_args()
+
+    # Must be configured before database.py reads the environment and creates the client
+    if args.uri:
+        os.environ["MONGO_URI"] = args.uri
+    os.environ["DB_NAME"] = args.db_name
+    counter = CommandCounter()
+    monitoring.register(counter)
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    all_results = []
+    for size in [int(s) for s in args.sizes.split(",")]:
+        print(f"\n🔄 Dataset: {size} employees x {args.days} days")
+        all_results.extend(bench_size(counter, size, args.days, args.runs, args.seed))
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "runs": args.runs,
+            "seed": args.seed,
+            "results": all_results
+        }, f, indent=2)
+    print(f"\n✅ Results written to {args.output}")
+
+    if args.compare:
+        compare(all_results, args.compare)
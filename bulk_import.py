@@ -0,0 +1,267 @@
+"""
+Bulk Employee Onboarding
+Streams a CSV of users and profiles into `users` and `employees`
+Usage: python bulk_import.py employees.csv [--rounds 10] [--batch-size 1000]
+
+CSV columns (header row required):
+    employee_id, email, name, password     required
+    role                                   employee (default) or admin
+    department, designation, employment_type, manager,
+    joining_date (YYYY-MM-DD), phone, address,
+    basic, hra, allowances, deductions     optional profile fields
+
+Duplicates are detected by the unique indexes on users.email,
+users.employee_id and employees.employee_id, not by per-row lookups.
+
+Inside the app, passwords are hashed on auth's shared, admission-controlled
+pool so an import cannot starve logins; the CLI uses its own pool.
+"""
+
+import argparse
+import csv
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from pymongo.errors import BulkWriteError
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+from database import users_col, employees_col
+from auth import hash_password, normalize_email, run_password_work, AUTH_WORKERS
+import daily_summary
+import employee_directory
+
+REQUIRED_COLUMNS = ("employee_id", "email", "name", "password")
+SALARY_COLUMNS = ("basic", "hra", "allowances", "deductions")
+# CLI only: private hashing pool size
+IMPORT_HASH_WORKERS = int(os.getenv("IMPORT_HASH_WORKERS", str(os.cpu_count() or 2)))
+# In the app: concurrent jobs on the shared pool, leaving the rest for logins
+IMPORT_SHARED_JOBS = max(1, AUTH_WORKERS // 2)
+IMPORT_BUSY_RETRY_SECONDS = 0.05
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _validate(row: dict):
+    """Return an error message for an invalid row, else None"""
+    missing = [c for c in REQUIRED_COLUMNS if not (row.get(c) or "").strip()]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    if len(row["password"]) < 6:
+        return "password must be at least 6 characters"
+    if (row.get("role") or "employee").strip().lower() not in ("employee", "admin"):
+        return f"unknown role '{row['role']}'"
+    if (row.get("joining_date") or "").strip():
+        try:
+            datetime.strptime(row["joining_date"].strip(), "%Y-%m-%d")
+        except ValueError:
+            return "joining_date must be YYYY-MM-DD"
+    for field in SALARY_COLUMNS:
+        try:
+            valid = math.isfinite(_money(row, field))
+        except ValueError:
+            valid = False
+        if not valid:
+            return f"{field} must be a plain number (e.g. 50000)"
+    return None
+
+
+def _money(row: dict, field: str) -> float:
+    value = (row.get(field) or "").strip()
+    return float(value) if value else 0
+
+
+def build_user(row: dict, hashed: bytes) -> dict:
+    """Build a `users` document from a CSV row"""
+    return {
+        "employee_id": row["employee_id"].strip(),
+        "email": normalize_email(row["email"]),
+        "password": hashed,
+        "name": row["name"].strip(),
+        "role": (row.get("role") or "employee").strip().lower()
+    }
+
+
+def build_employee(row: dict) -> dict:
+    """Build an `employees` profile document from a CSV row (same shape as init_db)"""
+    joining_date = (row.get("joining_date") or "").strip()
+    return {
+        "employee_id": row["employee_id"].strip(),
+        "name": row["name"].strip(),
+        "department": (row.get("department") or "").strip(),
+        "designation": (row.get("designation") or "").strip(),
+        "job_details": {
+            "joining_date": datetime.strptime(joining_date, "%Y-%m-%d") if joining_date else None,
+            "employment_type": (row.get("employment_type") or "Full-time").strip(),
+            "manager": (row.get("manager") or "").strip()
+        },
+        "salary_structure": {
+            "basic": _money(row, "basic"),
+            "hra": _money(row, "hra"),
+            "allowances": _money(row, "allowances"),
+            "deductions": _money(row, "deductions")
+        },
+        "contact": {
+            "email": normalize_email(row["email"]),
+            "phone": (row.get("phone") or "").strip(),
+            "address": (row.get("address") or "").strip()
+        },
+        "documents": [],
+        "profile_picture": "",
+        "leaves_balance": {
+            "paid": 20,
+            "sick": 10,
+            "unpaid": 5
+        }
+    }
+
+
+def _insert_unordered(col, docs: list, row_numbers: list, failures: list, note: str = "") -> set:
+    """
+    insert_many(ordered=False), mapping write errors back to CSV rows (with
+    `note` appended to each reason)
+
+    Returns:
+        Indexes (into docs) that failed
+    """
+    if not docs:
+        return set()
+    try:
+        col.insert_many(docs, ordered=False)
+        return set()
+    except BulkWriteError as e:
+        failed = set()
+        for error in e.details.get("writeErrors", []):
+            failed.add(error["index"])
+            if error.get("code") == 11000:
+                key = ", ".join(f"{k}={v}" for k, v in (error.get("keyValue") or {}).items())
+                reason = f"duplicate {col.name} ({key})" if key else f"duplicate {col.name}"
+            else:
+                reason = error.get("errmsg", "write failed")
+            failures.append((row_numbers[error["index"]], reason + note))
+        return failed
+
+
+def _hash_on_shared_pool(password: str, rounds: int) -> bytes:
+    """Hash on auth's shared pool, backing off while it is at capacity"""
+    while True:
+        accepted, hashed = run_password_work(hash_password, password, rounds)
+        if accepted:
+            return hashed
+        time.sleep(IMPORT_BUSY_RETRY_SECONDS)
+
+
+def _import_batch(rows: list, hash_fn, pool: ThreadPoolExecutor, rounds: int, result: dict):
+    """Hash, then write one batch of (row_number, row) pairs"""
+    hashes = list(pool.map(lambda item: hash_fn(item[1]["password"], rounds), rows))
+
+    # Build every document before writing, so a bad row cannot fail between the two inserts
+    users = [build_user(row, hashed) for (_, row), hashed in zip(rows, hashes)]
+    employees = [build_employee(row) if user["role"] == "employee" else None
+                 for (_, row), user in zip(rows, users)]
+    user_rows = [n for n, _ in rows]
+    failed = _insert_unordered(users_col, users, user_rows, result["failed"])
+
+    # Profiles only for newly created employee accounts
+    profiles = []
+    profile_users = []
+    profile_rows = []
+    for i, (n, _) in enumerate(rows):
+        if i not in failed and employees[i] is not None:
+            profiles.append(employees[i])
+            profile_users.append(users[i]["_id"])
+            profile_rows.append(n)
+    profile_failed = _insert_unordered(
+        employees_col, profiles, profile_rows, result["failed"], note="; user account removed"
+    )
+
+    # Compensate: an account without its profile would log in to a broken dashboard
+    if profile_failed:
+        users_col.delete_many({"_id": {"$in": [profile_users[i] for i in profile_failed]}})
+
+    result["users"] += len(users) - len(failed) - len(profile_failed)
+    result["employees"] += len(profiles) - len(profile_failed)
+
+
+def import_users(csv_file, rounds: int = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 hash_workers: int = None) -> dict:
+    """
+    Import users and employee profiles from a CSV text stream
+
+    Args:
+        csv_file: Text file object with a header row
+        rounds: bcrypt cost for imported passwords (default BCRYPT_ROUNDS);
+                a lower cost is upgraded on each user's first login
+        batch_size: Rows hashed and written per batch
+        hash_workers: Hash on a private pool of this size (CLI); by default
+                      hashing goes through auth's shared, bounded pool
+
+    Returns:
+        dict with rows, users, employees, failed [(row_number, reason)]
+        and seconds
+    """
+    start = time.perf_counter()
+    result = {"rows": 0, "users": 0, "employees": 0, "failed": []}
+
+    reader = csv.DictReader(csv_file)
+    missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        result["failed"].append((1, f"header is missing column(s): {', '.join(missing)}"))
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+    if hash_workers:
+        hash_fn, workers = hash_password, hash_workers
+    else:
+        hash_fn, workers = _hash_on_shared_pool, IMPORT_SHARED_JOBS
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import-bcrypt") as pool:
+        batch = []
+        # Data rows start at line 2 (line 1 is the header)
+        for row_number, row in enumerate(reader, start=2):
+            result["rows"] += 1
+            error = _validate(row)
+            if error:
+                result["failed"].append((row_number, error))
+                continue
+
+            batch.append((row_number, row))
+            if len(batch) >= batch_size:
+                _import_batch(batch, hash_fn, pool, rounds, result)
+                batch = []
+
+        if batch:
+            _import_batch(batch, hash_fn, pool, rounds, result)
+
+    if result["users"]:
+        employee_directory.invalidate()
+        daily_summary.rebuild_totals()
+
+    result["failed"].sort()
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users and employee profiles from CSV")
+    parser.add_argument("csv_path", help="CSV file to import")
+    parser.add_argument("--rounds", type=int, default=None, help="bcrypt cost for imported passwords")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    print(f"🔄 Importing {args.csv_path}...")
+    with open(args.csv_path, newline="", encoding="utf-8-sig") as f:
+        summary = import_users(f, rounds=args.rounds, batch_size=args.batch_size,
+                               hash_workers=IMPORT_HASH_WORKERS)
+
+    print(f"  ✓ Rows read: {summary['rows']}")
+    print(f"  ✓ Users created: {summary['users']}")
+    print(f"  ✓ Employee profiles created: {summary['employees']}")
+    if summary["failed"]:
+        print(f"\n❌ {len(summary['failed'])} row(s) failed:")
+        for row_number, reason in summary["failed"]:
+            print(f"   - line {row_number}: {reason}")
+    print(f"\n✅ Import finished in {summary['seconds']:.1f}s\n")
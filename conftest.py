@@ -0,0 +1,21 @@
+"""
+Test Configuration
+Tests run against an in-memory mongomock client, never a real MongoDB
+Usage: pip install -r requirements-dev.txt && python -m pytest -q
+"""
+
+import pytest
+
+# Connection check script (python test_db.py), not a test module
+collect_ignore = ["test_db.py"]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Point database.get_client at a fresh mongomock client"""
+    mongomock = pytest.importorskip("mongomock")
+    import database
+
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(database, "get_client", lambda: client)
+    return database.get_db()
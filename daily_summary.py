@@ -0,0 +1,105 @@
+"""
+Daily Summary Rollups
+Maintains per-date attendance counters and company-wide totals so the admin
+overview tiles are served from one indexed read instead of full scans
+
+Documents in `daily_summary`:
+    {"_id": <date at midnight>, "present", "absent", "checked_in"}
+    {"_id": "totals", "total_employees", "pending_leaves"}
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+from database import daily_summary_col, employees_col, leave_requests_col, attendance_col, working_hours_col
+
+TOTALS_ID = "totals"
+
+
+def _inc_day(date, fields: dict):
+    """Increment counters on a day's summary, creating it if needed"""
+    daily_summary_col.update_one({"_id": date}, {"$inc": fields}, upsert=True)
+
+
+def _inc_totals(fields: dict):
+    """Increment company-wide counters (rebuilt on next read if missing)"""
+    daily_summary_col.update_one({"_id": TOTALS_ID}, {"$inc": fields})
+
+
+def record_check_in(date):
+    """An employee checked in on `date`"""
+    _inc_day(date, {"checked_in": 1})
+
+
+def record_check_out(date, status: str):
+    """An employee checked out on `date` and was marked `status`"""
+    _inc_day(date, {"checked_in": -1, status: 1})
+
+
+def record_leave_applied(count: int = 1):
+    """New leave request(s) entered the pending queue"""
+    _inc_totals({"pending_leaves": count})
+
+
+def record_leave_decided(count: int = 1):
+    """Pending leave request(s) were approved or rejected"""
+    _inc_totals({"pending_leaves": -count})
+
+
+def rebuild_totals() -> dict:
+    """Recount company-wide totals from the source collections"""
+    totals = {
+        "total_employees": employees_col.count_documents({}),
+        "pending_leaves": leave_requests_col.count_documents({"status": "pending"})
+    }
+    daily_summary_col.update_one({"_id": TOTALS_ID}, {"$set": totals}, upsert=True)
+    return totals
+
+
+def rebuild_day(date) -> dict:
+    """Recount a day's attendance counters from the source collections"""
+    counts = {"present": 0, "absent": 0}
+    for row in attendance_col.aggregate([
+        {"$match": {"date": date}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ]):
+        if row["_id"] in counts:
+            counts[row["_id"]] = row["count"]
+    counts["checked_in"] = working_hours_col.count_documents({"date": date, "status": "checked_in"})
+
+    daily_summary_col.update_one({"_id": date}, {"$setOnInsert": counts}, upsert=True)
+    return counts
+
+
+def reset():
+    """Drop all rollups and recount totals (used after bulk data loads)"""
+    daily_summary_col.delete_many({})
+    rebuild_totals()
+
+
+def get_overview(date) -> dict:
+    """
+    Read the admin overview counters for a date
+
+    Returns:
+        dict with total_employees, pending_leaves, present, absent, checked_in
+    """
+    docs = {d["_id"]: d for d in daily_summary_col.find({"_id": {"$in": [date, TOTALS_ID]}})}
+
+    totals = docs.get(TOTALS_ID)
+    if not totals or "total_employees" not in totals:
+        totals = rebuild_totals()
+
+    day = docs.get(date)
+    if not day:
+        day = rebuild_day(date)
+
+    return {
+        "total_employees": totals.get("total_employees", 0),
+        "pending_leaves": max(totals.get("pending_leaves", 0), 0),
+        "present": day.get("present", 0),
+        "absent": day.get("absent", 0),
+        "checked_in": max(day.get("checked_in", 0), 0)
+    }
@@ -1,50 +1,86 @@
-# database.py - COMPLETE UPDATED FILE
-
 """
 MongoDB Database Configuration
 Handles all database connections and collections
+
+The MongoClient is created lazily on first use and cached for the whole
+process, so every Streamlit session shares one connection pool and importing
+this module never touches the network. Indexes are managed by migrate.py.
 """
 
 import os
+from functools import lru_cache
 from pymongo import MongoClient
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# MongoDB connection
+# MongoDB connection settings
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "dayflow_hrms")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_TIMEOUT_MS = int(os.getenv("MONGO_TIMEOUT_MS", "5000"))
+
+# Module attribute name -> collection name
+COLLECTIONS = {
+    "users_col": "users",
+    "employees_col": "employees",
+    "attendance_col": "attendance",
+    "leave_requests_col": "leave_requests",
+    "working_hours_col": "working_hours",
+    "daily_summary_col": "daily_summary",
+    "sessions_col": "sessions",
+    "payroll_snapshots_col": "payroll_snapshots",
+}
+
+
+@lru_cache(maxsize=None)
+def get_client() -> MongoClient:
+    """
+    Return the process-wide MongoClient
+
+    The client is built with connect=False, so no server round trip happens
+    until the first real operation.
+    """
+    return MongoClient(
+        MONGO_URI,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+        connect=False
+    )
+
+
+def get_db():
+    """Return the application database handle"""
+    return get_client()[DB_NAME]
+
+
+def get_collection(name: str):
+    """Return a collection handle by collection name"""
+    return get_db()[name]
+
+
+def ping() -> bool:
+    """
+    Check that MongoDB is reachable
+
+    Returns:
+        True if the server answered, False otherwise
+    """
+    try:
+        get_client().admin.command("ping")
+        return True
+    except Exception as e:
+        print(f"❌ MongoDB connection failed: {e}")
+        return False
+
 
-try:
-    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
-    # Test connection
-    client.admin.command('ping')
-    print("✅ Connected to MongoDB")
-    
-    db = client[DB_NAME]
-    
-    # Collections
-    users_col = db["users"]
-    employees_col = db["employees"]
-    attendance_col = db["attendance"]
-    leave_requests_col = db["leave_requests"]
-    working_hours_col = db["working_hours"]  # ✅ NEW
-    
-    # Create indexes for better performance
-    users_col.create_index("employee_id", unique=True)
-    users_col.create_index("email", unique=True)
-    employees_col.create_index("employee_id", unique=True)
-    attendance_col.create_index([("employee_id", 1), ("date", -1)])
-    leave_requests_col.create_index([("employee_id", 1), ("status", 1)])
-    working_hours_col.create_index([("employee_id", 1), ("date", -1)])  # ✅ NEW
-    
-    print("✅ Database indexes created")
-    
-except Exception as e:
-    print(f"❌ MongoDB connection failed: {e}")
-    users_col = None
-    employees_col = None
-    attendance_col = None
-    leave_requests_col = None
-    working_hours_col = None  # ✅ NEW
\ No newline at end of file
+def __getattr__(name: str):
+    """Resolve `db` and the `*_col` handles lazily on attribute access"""
+    if name == "db":
+        return get_db()
+    if name in COLLECTIONS:
+        return get_collection(COLLECTIONS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
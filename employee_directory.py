@@ -0,0 +1,99 @@
+"""
+Employee Directory Cache
+In-process, TTL-bound list of employee IDs, names and departments used to
+build selectors without re-reading full employee documents on every rerun,
+plus the indexed prefix search behind the admin employee picker
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from pymongo.collation import Collation
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+import queries
+
+DIRECTORY_TTL_SECONDS = int(os.getenv("DIRECTORY_TTL_SECONDS", "300"))
+
+# Case-insensitive comparisons; must match the *_search indexes (migration 7)
+SEARCH_COLLATION = Collation(locale="en", strength=2)
+SEARCH_FIELDS = ("employee_id", "name", "department")
+SEARCH_PAGE_SIZE = 20
+
+_lock = threading.Lock()
+_cache = {"loaded_at": 0.0, "employees": None}
+
+
+def get_employees() -> list:
+    """
+    Return all employees as {employee_id, name, department} dicts
+
+    The list is shared by every session in the process and reloaded when
+    older than DIRECTORY_TTL_SECONDS or after invalidate().
+    """
+    with _lock:
+        employees = _cache["employees"]
+        if employees is not None and time.monotonic() - _cache["loaded_at"] < DIRECTORY_TTL_SECONDS:
+            return employees
+
+        employees = list(queries.find("employee_directory", {}, sort="employee_id"))
+        _cache["employees"] = employees
+        _cache["loaded_at"] = time.monotonic()
+        return employees
+
+
+def get_names() -> dict:
+    """Return {employee_id: name} for all employees"""
+    return {e["employee_id"]: e.get("name", "-") for e in get_employees()}
+
+
+def get_departments() -> list:
+    """Return the sorted, non-empty department names"""
+    return sorted({e["department"] for e in get_employees() if e.get("department")})
+
+
+def department_ids(department: str) -> list:
+    """Return the employee IDs in a department"""
+    return [e["employee_id"] for e in get_employees() if e.get("department") == department]
+
+
+def search(term: str, after: str = None, limit: int = SEARCH_PAGE_SIZE) -> tuple:
+    """
+    Case-insensitive prefix search on employee ID, name and department
+
+    Each field is matched as an index range ([term, term + U+FFFF) under
+    SEARCH_COLLATION), so the query is answered from the *_search indexes
+    and only one page of matches is returned.
+
+    Args:
+        term: Prefix to match (blank matches everyone)
+        after: Employee ID of the previous page's last match (keyset paging)
+        limit: Page size
+
+    Returns:
+        (matches, has_more) with matches as {employee_id, name, department} dicts
+    """
+    term = term.strip()
+    query = {}
+    if term:
+        query["$or"] = [{field: {"$gte": term, "$lt": term + "\uffff"}} for field in SEARCH_FIELDS]
+    if after:
+        query["employee_id"] = {"$gt": after}
+
+    matches = list(queries.find(
+        "employee_directory",
+        query,
+        sort="employee_id",
+        limit=limit + 1,
+        collation=SEARCH_COLLATION
+    ))
+    return matches[:limit], len(matches) > limit
+
+
+def invalidate():
+    """Drop the cached directory after a write to `employees`"""
+    with _lock:
+        _cache["employees"] = None
@@ -2,61 +2,67 @@
 Database Initialization Script
 Run this ONCE to populate demo data
 Usage: python init_db.py
+       python init_db.py --generate --employees 10000 --days 730 [--seed 42]
 """
 
-from database import users_col, employees_col, attendance_col, leave_requests_col
+import argparse
+import random
+import time
+from database import users_col, employees_col, attendance_col, leave_requests_col, working_hours_col
+from migrate import run_migrations
+from analytics import MIN_DAILY_HOURS
+import daily_summary
+import employee_directory
 from datetime import datetime, timedelta
-import bcrypt
+from auth import hash_password
 
 def init_demo_data():
     """Initialize database with demo users and data"""
     
     print("🔄 Initializing demo data...")
     
+    run_migrations()
+    
     # Clear existing data
-    if users_col is not None:
-        users_col.delete_many({})
-        print("  ✓ Cleared users")
+    users_col.delete_many({})
+    print("  ✓ Cleared users")
     
-    if employees_col is not None:
-        employees_col.delete_many({})
-        print("  ✓ Cleared employees")
+    employees_col.delete_many({})
+    print("  ✓ Cleared employees")
     
-    if attendance_col is not None:
-        attendance_col.delete_many({})
-        print("  ✓ Cleared attendance")
+    attendance_col.delete_many({})
+    print("  ✓ Cleared attendance")
     
-    if leave_requests_col is not None:
-        leave_requests_col.delete_many({})
-        print("  ✓ Cleared leave requests")
+    leave_requests_col.delete_many({})
+    print("  ✓ Cleared leave requests")
     
     # Demo users
     demo_users = [
         {
             "employee_id": "EMP001",
             "email": "john@company.com",
-            "password": bcrypt.hashpw("pass123".encode(), bcrypt.gensalt()),
+            "password": hash_password("pass123"),
             "name": "John Doe",
             "role": "employee"
         },
         {
             "employee_id": "EMP002",
             "email": "jane@company.com",
-            "password": bcrypt.hashpw("pass123".encode(), bcrypt.gensalt()),
+            "password": hash_password("pass123"),
             "name": "Jane Smith",
             "role": "employee"
         },
         {
             "employee_id": "EMP003",
             "email": "bob@company.com",
-            "password": bcrypt.hashpw("pass123".encode(), bcrypt.gensalt()),
+            "password": hash_password("pass123"),
             "name": "Bob Wilson",
             "role": "employee"
         },
         {
             "employee_id": "ADMIN001",
             "email": "admin@company.com",
-            "password": bcrypt.hashpw("admin123".encode(), bcrypt.gensalt()),
+            "password": hash_password("admin123"),
             "name": "Admin User",
             "role": "admin"
         }
@@ -64,132 +70,362 @@ def init_demo_data():
     
     # Insert users and create employee profiles
     for user in demo_users:
-        if users_col is not None:
-            users_col.insert_one(user)
-            print(f"  ✓ Added user: {user['name']}")
-            
-            # Create employee record only for employees (not admin)
-            if user["role"] == "employee" and employees_col is not None:
-                employees_col.insert_one({
-                    "employee_id": user["employee_id"],
-                    "name": user["name"],
-                    "department": "Engineering",
-                    "designation": "Developer",
-                    "job_details": {
-                        "joining_date": datetime.now().replace(
-                            hour=0, minute=0, second=0, microsecond=0
-                        ),
-                        "employment_type": "Full-time",
-                        "manager": "Jane Manager"
-                    },
-                    "salary_structure": {
-                        "basic": 50000,
-                        "hra": 20000,
-                        "allowances": 10000,
-                        "deductions": 5000
-                    },
-                    # SAFE DEFAULTS so employee can enter these via Profile tab
-                    "contact": {
-                        "email": user["email"],
-                        "phone": "",
-                        "address": ""
+        users_col.insert_one(user)
+        print(f"  ✓ Added user: {user['name']}")
+        
+        # Create employee record only for employees (not admin)
+        if user["role"] == "employee":
+            employees_col.insert_one({
+                "employee_id": user["employee_id"],
+                "name": user["name"],
+                "department": "Engineering",
+                "designation": "Developer",
+                "job_details": {
+                    "joining_date": datetime.now().replace(
+                        hour=0, minute=0, second=0, microsecond=0
+                    ),
+                    "employment_type": "Full-time",
+                    "manager": "Jane Manager"
+                },
+                "salary_structure": {
+                    "basic": 50000,
+                    "hra": 20000,
+                    "allowances": 10000,
+                    "deductions": 5000
+                },
+                # SAFE DEFAULTS so employee can enter these via Profile tab
+                "contact": {
+                    "email": user["email"],
+                    "phone": "",
+                    "address": ""
+                },
+                "documents": [
+                    {
+                        "title": "Offer Letter",
+                        "type": "pdf",
+                        "url": "https://example.com/offer-letter.pdf"
                     },
-                    "documents": [
-                        {
-                            "title": "Offer Letter",
-                            "type": "pdf",
-                            "url": "https://example.com/offer-letter.pdf"
-                        },
-                        {
-                            "title": "ID Proof",
-                            "type": "image",
-                            "url": "https://example.com/id-proof.png"
-                        }
-                    ],
-                    "profile_picture": "",
-                    "leaves_balance": {
-                        "paid": 20,
-                        "sick": 10,
-                        "unpaid": 5
+                    {
+                        "title": "ID Proof",
+                        "type": "image",
+                        "url": "https://example.com/id-proof.png"
                     }
-                })
-                print(f"    ✓ Created employee profile")
+                ],
+                "profile_picture": "",
+                "leaves_balance": {
+                    "paid": 20,
+                    "sick": 10,
+                    "unpaid": 5
+                }
+            })
+            print(f"    ✓ Created employee profile")
     
     # Demo attendance records (last 30 days) for EMP001
-    if attendance_col is not None:
-        today = datetime.now()
-        for i in range(30):
-            date = today - timedelta(days=i)
-            # Only add weekday records
-            if date.weekday() < 5:
-                status = "present" if i % 3 != 0 else "absent"
-                check_in = "09:30 AM" if status == "present" else None
-                check_out = "06:00 PM" if status == "present" else None
-                
-                attendance_col.insert_one({
-                    "employee_id": "EMP001",
-                    "date": date.replace(hour=0, minute=0, second=0, microsecond=0),
-                    "status": status,
-                    "check_in": check_in,
-                    "check_out": check_out
-                })
-        
-        print(f"  ✓ Added 30 days attendance records for EMP001")
+    today = datetime.now()
+    for i in range(30):
+        date = (today - timedelta(days=i)).replace(hour=0, minute=0, second=0, microsecond=0)
+        # Only add weekday records
+        if date.weekday() < 5:
+            status = "present" if i % 3 != 0 else "absent"
+            check_in = date + timedelta(hours=9, minutes=30) if status == "present" else None
+            check_out = date + timedelta(hours=18) if status == "present" else None
+            
+            attendance_col.insert_one({
+                "employee_id": "EMP001",
+                "date": date,
+                "status": status,
+                "check_in": check_in,
+                "check_out": check_out
+            })
+    
+    print(f"  ✓ Added 30 days attendance records for EMP001")
     
     # Demo leave requests
-    if leave_requests_col is not None:
-        demo_leaves = [
-            {
-                "employee_id": "EMP001",
-                "start_date": (datetime.now() + timedelta(days=5)).replace(
-                    hour=0, minute=0, second=0, microsecond=0
-                ),
-                "end_date": (datetime.now() + timedelta(days=7)).replace(
-                    hour=0, minute=0, second=0, microsecond=0
-                ),
-                "leave_type": "paid",
-                "reason": "Personal work",
-                "status": "pending",
-                "days": 3,
-                "applied_at": datetime.now()
-            },
-            {
-                "employee_id": "EMP002",
-                "start_date": (datetime.now() + timedelta(days=10)).replace(
-                    hour=0, minute=0, second=0, microsecond=0
-                ),
-                "end_date": (datetime.now() + timedelta(days=12)).replace(
-                    hour=0, minute=0, second=0, microsecond=0
-                ),
-                "leave_type": "sick",
-                "reason": "Medical appointment",
-                "status": "pending",
-                "days": 3,
-                "applied_at": datetime.now()
-            },
-            {
-                "employee_id": "EMP003",
-                "start_date": (datetime.now() + timedelta(days=2)).replace(
-                    hour=0, minute=0, second=0, microsecond=0
-                ),
-                "end_date": (datetime.now() + timedelta(days=4)).replace(
-                    hour=0, minute=0, second=0, microsecond=0
-                ),
-                "leave_type": "unpaid",
-                "reason": "Family emergency",
-                "status": "pending",
-                "days": 3,
-                "applied_at": datetime.now()
-            }
-        ]
-        
-        leave_requests_col.insert_many(demo_leaves)
-        print(f"  ✓ Added 3 demo leave requests")
+    demo_leaves = [
+        {
+            "employee_id": "EMP001",
+            "start_date": (datetime.now() + timedelta(days=5)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ),
+            "end_date": (datetime.now() + timedelta(days=7)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ),
+            "leave_type": "paid",
+            "reason": "Personal work",
+            "status": "pending",
+            "days": 3,
+            "applied_at": datetime.now()
+        },
+        {
+            "employee_id": "EMP002",
+            "start_date": (datetime.now() + timedelta(days=10)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ),
+            "end_date": (datetime.now() + timedelta(days=12)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ),
+            "leave_type": "sick",
+            "reason": "Medical appointment",
+            "status": "pending",
+            "days": 3,
+            "applied_at": datetime.now()
+        },
+        {
+            "employee_id": "EMP003",
+            "start_date": (datetime.now() + timedelta(days=2)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ),
+            "end_date": (datetime.now() + timedelta(days=4)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ),
+            "leave_type": "unpaid",
+            "reason": "Family emergency",
+            "status": "pending",
+            "days": 3,
+            "applied_at": datetime.now()
+        }
+    ]
+    
+    leave_requests_col.insert_many(demo_leaves)
+    print(f"  ✓ Added 3 demo leave requests")
+    
+    # Rollups are recounted from the fresh data
+    daily_summary.reset()
+    print("  ✓ Reset daily summary rollups")
     
     print("\n✅ Demo data initialization complete!\n")
     print("📝 Demo Credentials:")
     print("   Employee: john@company.com / pass123")
     print("   Admin: admin@company.com / admin123\n")
 
+# =========================================================
+# SYNTHETIC DATA GENERATOR (load / benchmark datasets)
+# =========================================================
+
+FIRST_NAMES = ["Aarav", "Priya", "John", "Jane", "Bob", "Meera", "Ravi", "Sara", "Liam", "Anika",
+               "Kabir", "Zoe", "Omar", "Ishaan", "Nina", "Arjun", "Emma", "Vikram", "Leah", "Dev"]
+LAST_NAMES = ["Sharma", "Doe", "Smith", "Wilson", "Patel", "Khan", "Iyer", "Brown", "Singh", "Garcia",
+              "Nair", "Lee", "Mehta", "Taylor", "Rao", "Clark", "Das", "Lopez", "Gupta", "Young"]
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "Finance", "HR", "Operations", "Support",
+               "Product", "Legal", "Design", "Research", "Logistics"]
+LEAVE_TYPES = ["paid", "sick", "unpaid"]
+LEAVE_STATUSES = (["approved"] * 6) + (["rejected"] * 2) + ["pending"]
+GENERATED_PASSWORD = "pass123"
+# Last generated day when --seed is given without --end-date
+GENERATED_END_DATE = datetime(2026, 6, 30)
+
+def _insert_batched(col, docs, batch_size: int) -> int:
+    """Insert documents from an iterable with unordered insert_many batches"""
+    total = 0
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            col.insert_many(batch, ordered=False)
+            total += len(batch)
+            batch = []
+    if batch:
+        col.insert_many(batch, ordered=False)
+        total += len(batch)
+    return total
+
+def generate_data(
+    employees: int = 1000,
+    days: int = 90,
+    departments: int = 6,
+    leave_rate: float = 0.03,
+    absence_rate: float = 0.05,
+    checkin_mean: float = 9.5,
+    checkin_std: float = 0.5,
+    hours_mean: float = 8.0,
+    hours_std: float = 1.0,
+    seed: int = 42,
+    batch_size: int = 5000,
+    end_date: datetime = None
+):
+    """
+    Replace all data with a reproducible synthetic dataset
+
+    Args:
+        employees: Number of employees (plus one admin)
+        days: Calendar days of history ending at end_date (weekdays get records)
+        departments: Number of departments to spread employees across
+        leave_rate: Leave requests per employee per weekday
+        absence_rate: Share of weekdays with no check-in at all
+        checkin_mean / checkin_std: Check-in time of day in hours (normal)
+        hours_mean / hours_std: Worked hours per day (normal, clipped to 1-12)
+        seed: Random seed; the same arguments (including end_date) always
+              produce the same data, whatever day the script runs
+        batch_size: Documents per insert_many call
+        end_date: Last day of history (default: today)
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    end_date = (end_date or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    weekdays = [end_date - timedelta(days=i) for i in range(days - 1, -1, -1)]
+    weekdays = [d for d in weekdays if d.weekday() < 5]
+    dept_names = (DEPARTMENTS * (departments // len(DEPARTMENTS) + 1))[:departments]
+    dept_names = [name if i < len(DEPARTMENTS) else f"{name} {i // len(DEPARTMENTS) + 1}"
+                  for i, name in enumerate(dept_names)]
+    emp_ids = [f"EMP{n:05d}" for n in range(1, employees + 1)]
+
+    print(f"🔄 Generating {employees} employees x {len(weekdays)} weekdays "
+          f"to {end_date:%Y-%m-%d} (seed={seed})...")
+    run_migrations()
+
+    for col in (users_col, employees_col, attendance_col, working_hours_col, leave_requests_col):
+        col.delete_many({})
+    print("  ✓ Cleared existing data")
+
+    # One hash shared by every generated account keeps bcrypt out of the load time
+    password = hash_password(GENERATED_PASSWORD)
+    people = [
+        (emp_id, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.choice(dept_names))
+        for emp_id in emp_ids
+    ]
+
+    def users():
+        yield {"employee_id": "ADMIN001", "email": "admin@company.com", "password": password,
+               "name": "Admin User", "role": "admin"}
+        for emp_id, name, _ in people:
+            yield {"employee_id": emp_id, "email": f"{emp_id.lower()}@company.com",
+                   "password": password, "name": name, "role": "employee"}
+
+    def profiles():
+        for emp_id, name, dept in people:
+            yield {
+                "employee_id": emp_id,
+                "name": name,
+                "department": dept,
+                "designation": "Associate",
+                "job_details": {
+                    "joining_date": weekdays[0] - timedelta(days=rng.randint(0, 1500)),
+                    "employment_type": "Full-time",
+                    "manager": "Admin User"
+                },
+                "salary_structure": {
+                    "basic": rng.randrange(30000, 120000, 1000),
+                    "hra": rng.randrange(10000, 40000, 1000),
+                    "allowances": rng.randrange(5000, 20000, 1000),
+                    "deductions": rng.randrange(2000, 10000, 500)
+                },
+                "contact": {"email": f"{emp_id.lower()}@company.com", "phone": "", "address": ""},
+                "documents": [],
+                "profile_picture": "",
+                "leaves_balance": {"paid": 20, "sick": 10, "unpaid": 5}
+            }
+
+    print(f"  ✓ Users: {_insert_batched(users_col, users(), batch_size)}")
+    print(f"  ✓ Employee profiles: {_insert_batched(employees_col, profiles(), batch_size)}")
+
+    # Attendance and working hours are generated together. Each employee-day
+    # has its own stream and always draws the same three values, so a day's
+    # record does not depend on the window, the calendar or other employees.
+    day_records = []
+
+    def attendance():
+        for emp_id in emp_ids:
+            for date in weekdays:
+                day_rng = random.Random(f"{seed}:{emp_id}:{date:%Y-%m-%d}")
+                absent = day_rng.random() < absence_rate
+                check_in_hour = day_rng.gauss(checkin_mean, checkin_std)
+                worked = day_rng.gauss(hours_mean, hours_std)
+                if absent:
+                    yield {"employee_id": emp_id, "date": date, "status": "absent",
+                           "check_in": None, "check_out": None}
+                    continue
+                check_in = date + timedelta(hours=check_in_hour)
+                hours = round(min(max(worked, 1), 12), 2)
+                check_out = check_in + timedelta(hours=hours)
+                day_records.append({
+                    "employee_id": emp_id, "date": date, "check_in": check_in,
+                    "check_out": check_out, "working_hours": hours, "status": "checked_out"
+                })
+                yield {
+                    "employee_id": emp_id, "date": date,
+                    "status": "present" if hours >= MIN_DAILY_HOURS else "absent",
+                    "check_in": check_in,
+                    "check_out": check_out,
+                    "working_hours": hours
+                }
+                if len(day_records) >= batch_size:
+                    working_hours_col.insert_many(day_records, ordered=False)
+                    day_records.clear()
+
+    attendance_count = _insert_batched(attendance_col, attendance(), batch_size)
+    if day_records:
+        working_hours_col.insert_many(day_records, ordered=False)
+    print(f"  ✓ Attendance: {attendance_count}")
+    print(f"  ✓ Working hours: {working_hours_col.estimated_document_count()}")
+
+    def leaves():
+        per_employee = leave_rate * len(weekdays)
+        for emp_id in emp_ids:
+            leave_rng = random.Random(f"{seed}:{emp_id}:leaves")
+            count = int(per_employee) + (1 if leave_rng.random() < per_employee % 1 else 0)
+            for _ in range(count):
+                start = leave_rng.choice(weekdays)
+                length = leave_rng.randint(1, 3)
+                yield {
+                    "employee_id": emp_id,
+                    "leave_type": leave_rng.choice(LEAVE_TYPES),
+                    "start_date": start,
+                    "end_date": start + timedelta(days=length - 1),
+                    "days": length,
+                    "reason": "Generated",
+                    "status": leave_rng.choice(LEAVE_STATUSES),
+                    "applied_on": start - timedelta(days=leave_rng.randint(1, 14), hours=leave_rng.randint(0, 23))
+                }
+
+    print(f"  ✓ Leave requests: {_insert_batched(leave_requests_col, leaves(), batch_size)}")
+
+    daily_summary.reset()
+    employee_directory.invalidate()
+
+    print(f"\n✅ Generated dataset in {time.perf_counter() - started:.1f}s\n")
+    print("📝 Credentials:")
+    print(f"   Employee: emp00001@company.com / {GENERATED_PASSWORD}")
+    print(f"   Admin: admin@company.com / {GENERATED_PASSWORD}\n")
+
 if __name__ == "__main__":
-    init_demo_data()
+    parser = argparse.ArgumentParser(description="Initialize Dayflow data")
+    parser.add_argument("--generate", action="store_true", help="generate a synthetic dataset instead of the demo data")
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--departments", type=int, default=6)
+    parser.add_argument("--leave-rate", type=float, default=0.03)
+    parser.add_argument("--absence-rate", type=float, default=0.05)
+    parser.add_argument("--checkin-mean", type=float, default=9.5, help="mean check-in hour of day")
+    parser.add_argument("--checkin-std", type=float, default=0.5)
+    parser.add_argument("--hours-mean", type=float, default=8.0)
+    parser.add_argument("--hours-std", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None,
+                        help=f"random seed (default 42); with --seed, history ends on "
+                             f"{GENERATED_END_DATE:%Y-%m-%d} unless --end-date is given")
+    parser.add_argument("--end-date", default=None, help="last day of history YYYY-MM-DD (default: today)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    # An explicit seed asks for a reproducible dataset, so anchor the calendar too
+    if args.end_date:
+        end_date = datetime.strptime(args.end_date, "%Y-%m-%d")
+    else:
+        end_date = GENERATED_END_DATE if args.seed is not None else None
+
+    if args.generate:
+        generate_data(
+            employees=args.employees,
+            days=args.days,
+            departments=args.departments,
+            leave_rate=args.leave_rate,
+            absence_rate=args.absence_rate,
+            checkin_mean=args.checkin_mean,
+            checkin_std=args.checkin_std,
+            hours_mean=args.hours_mean,
+            hours_std=args.hours_std,
+            seed=42 if args.seed is None else args.seed,
+            batch_size=args.batch_size,
+            end_date=end_date
+        )
+    else:
+        init_demo_data()
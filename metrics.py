@@ -0,0 +1,198 @@
+"""
+Application Metrics
+In-process render timing histograms and event counters, exported in the
+Prometheus text format through a local HTTP endpoint and/or a file
+
+Configuration:
+    METRICS_PORT   serve http://127.0.0.1:<port>/metrics (off if unset)
+    METRICS_FILE   rewrite this file after reruns, for node_exporter's
+                   textfile collector (off if unset)
+"""
+
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_PORT = os.getenv("METRICS_PORT")
+METRICS_FILE = os.getenv("METRICS_FILE")
+METRICS_FILE_INTERVAL_SECONDS = float(os.getenv("METRICS_FILE_INTERVAL_SECONDS", "10"))
+
+RENDER_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names: tuple, values: tuple) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name: str, help_text: str, labels: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        with _lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_label_text(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels"""
+
+    def __init__(self, name: str, help_text: str, labels: tuple, buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, value: float, *label_values):
+        with _lock:
+            series = self.series.setdefault(
+                label_values, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self.series.items()):
+            for bound, count in zip(self.buckets, series["buckets"]):
+                labels = _label_text(self.labels + ("le",), label_values + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _label_text(self.labels + ("le",), label_values + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {series['count']}")
+            labels = _label_text(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {series['sum']:.6f}")
+            lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+render_seconds = Histogram(
+    "dayflow_render_seconds",
+    "Wall time of one page render, by page and section",
+    ("page", "section"),
+    RENDER_BUCKETS
+)
+events_total = Counter(
+    "dayflow_events_total",
+    "Check-ins, check-outs, logins and leave actions",
+    ("event",)
+)
+
+
+def inc(event: str, amount: float = 1):
+    """Count an application event (check_in, check_out, login_success, ...)"""
+    events_total.inc(event, amount=amount)
+
+
+def set_section(section: str):
+    """Label the page render in progress on this thread with its section"""
+    _local.section = section
+
+
+def timed_page(page: str):
+    """Decorator: record a page function's wall time, labelled with its section"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            outer_section = getattr(_local, "section", None)
+            _local.section = "-"
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                # st.rerun()/st.stop() raise; their renders are still recorded
+                render_seconds.observe(time.perf_counter() - start, page, _local.section)
+                _local.section = outer_section
+                if page == "app":
+                    write_file()
+        return wrapper
+    return decorator
+
+
+def render_text() -> str:
+    """Return all metrics in the Prometheus text exposition format"""
+    with _lock:
+        lines = render_seconds.render() + events_total.render()
+    return "\n".join(lines) + "\n"
+
+
+# =========================================================
+# EXPORTERS
+# =========================================================
+
+_exporter_lock = threading.Lock()
+_server = None
+_last_file_write = 0.0
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server():
+    """Serve /metrics on 127.0.0.1:METRICS_PORT once per process"""
+    global _server
+    if not METRICS_PORT:
+        return
+    with _exporter_lock:
+        if _server is not None:
+            return
+        try:
+            _server = ThreadingHTTPServer(("127.0.0.1", int(METRICS_PORT)), _MetricsHandler)
+        except OSError as e:
+            print(f"⚠️ Metrics endpoint not started: {e}")
+            _server = False
+            return
+        threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"✅ Metrics at http://127.0.0.1:{METRICS_PORT}/metrics")
+
+
+def write_file(force: bool = False):
+    """Atomically rewrite METRICS_FILE, at most every METRICS_FILE_INTERVAL_SECONDS"""
+    global _last_file_write
+    if not METRICS_FILE:
+        return
+    now = time.monotonic()
+    with _exporter_lock:
+        if not force and now - _last_file_write < METRICS_FILE_INTERVAL_SECONDS:
+            return
+        _last_file_write = now
+    tmp_path = f"{METRICS_FILE}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(render_text())
+    os.replace(tmp_path, METRICS_FILE)
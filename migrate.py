@@ -0,0 +1,254 @@
+"""
+Database Migration Runner
+Builds indexes and schema changes once, recorded in `schema_migrations`
+Usage: python migrate.py [--status]
+"""
+
+import argparse
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from database import get_db
+from employee_directory import SEARCH_COLLATION
+
+MIGRATIONS_COL = "schema_migrations"
+
+
+def _initial_indexes(db):
+    """Indexes previously created on every import of database.py"""
+    db["users"].create_index("employee_id", unique=True, background=True)
+    db["users"].create_index("email", unique=True, background=True)
+    db["employees"].create_index("employee_id", unique=True, background=True)
+    db["attendance"].create_index([("employee_id", 1), ("date", -1)], background=True)
+    db["leave_requests"].create_index([("employee_id", 1), ("status", 1)], background=True)
+    db["working_hours"].create_index([("employee_id", 1), ("date", -1)], background=True)
+
+
+def _leave_request_indexes(db):
+    """Admin status filter and employee leave history"""
+    db["leave_requests"].create_index("status", background=True)
+    db["leave_requests"].create_index([("employee_id", 1), ("applied_on", -1)], background=True)
+
+
+def _leave_request_page_index(db):
+    """Keyset pagination of the admin leave list filtered by status"""
+    db["leave_requests"].create_index([("status", 1), ("_id", -1)], background=True)
+
+
+def _unique_daily_records(db):
+    """One working_hours and one attendance record per employee per day"""
+    for name in ("working_hours", "attendance"):
+        col = db[name]
+
+        # Remove duplicates left by racing check-ins, keeping the record with the most hours
+        duplicates = col.aggregate([
+            {"$sort": {"working_hours": -1}},
+            {"$group": {
+                "_id": {"employee_id": "$employee_id", "date": "$date"},
+                "ids": {"$push": "$_id"},
+                "count": {"$sum": 1}
+            }},
+            {"$match": {"count": {"$gt": 1}}}
+        ], allowDiskUse=True)
+        for group in duplicates:
+            col.delete_many({"_id": {"$in": group["ids"][1:]}})
+
+        # Replace the non-unique index on the same keys
+        if "employee_id_1_date_-1" in col.index_information():
+            col.drop_index("employee_id_1_date_-1")
+        col.create_index([("employee_id", 1), ("date", -1)], unique=True, background=True)
+
+
+def _session_ttl_index(db):
+    """Expire session resume tokens at their expires_at time"""
+    db["sessions"].create_index("expires_at", expireAfterSeconds=0, background=True)
+
+
+def _payroll_snapshot_index(db):
+    """One payroll row per employee per period"""
+    db["payroll_snapshots"].create_index([("period", 1), ("employee_id", 1)], unique=True, background=True)
+
+
+def _employee_search_indexes(db):
+    """Case-insensitive indexes for the employee picker's prefix search"""
+    for field in ("employee_id", "name", "department"):
+        db["employees"].create_index(field, name=f"{field}_search", collation=SEARCH_COLLATION, background=True)
+
+
+TIME_STRING = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*([AaPp][Mm])?\s*$")
+UNPARSED_EXAMPLES = 10
+
+
+def parse_time_string(value: str, date: datetime):
+    """
+    Parse an "HH:MM AM/PM" attendance string into a datetime on `date`
+
+    Check-out wrote "%H:%M %p" (24-hour hours with a suffix, e.g. "18:05 PM")
+    and the demo data wrote 12-hour times ("06:00 PM"); both are accepted.
+
+    Returns:
+        datetime, or None if the value does not parse
+    """
+    match = TIME_STRING.match(value or "")
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2))
+    suffix = (match.group(3) or "").upper()
+    if suffix == "PM" and hour < 12:
+        hour += 12
+    elif suffix == "AM" and hour == 12:
+        hour = 0
+    if hour > 23 or minute > 59:
+        return None
+    return date + timedelta(hours=hour, minutes=minute)
+
+
+def attendance_time_update(doc: dict) -> tuple:
+    """
+    Build the $set converting one attendance document's string times
+
+    Originals are kept in check_in_legacy / check_out_legacy so the
+    conversion can be audited or undone.
+
+    Returns:
+        ($set dict, list of field names whose non-empty value did not parse)
+    """
+    update = {}
+    unparsed = []
+    for field in ("check_in", "check_out"):
+        value = doc.get(field)
+        if not isinstance(value, str):
+            continue
+        parsed = parse_time_string(value, doc["date"])
+        update[field] = parsed
+        update[f"{field}_legacy"] = value
+        if parsed is None and value.strip() not in ("", "-"):
+            unparsed.append(field)
+    return update, unparsed
+
+
+def _typed_attendance_times(db):
+    """Convert attendance check_in/check_out display strings to datetimes"""
+    col = db["attendance"]
+    requests = []
+    converted = 0
+    unparsed = []
+    cursor = col.find(
+        {"$or": [{"check_in": {"$type": "string"}}, {"check_out": {"$type": "string"}}]},
+        {"date": 1, "check_in": 1, "check_out": 1}
+    )
+    for doc in cursor:
+        update, failed = attendance_time_update(doc)
+        unparsed.extend((doc["_id"], field, doc[field]) for field in failed)
+        requests.append(UpdateOne({"_id": doc["_id"]}, {"$set": update}))
+        if len(requests) >= 1000:
+            converted += col.bulk_write(requests, ordered=False).modified_count
+            requests = []
+    if requests:
+        converted += col.bulk_write(requests, ordered=False).modified_count
+
+    print(f"  ✓ Converted {converted} attendance record(s)")
+    if unparsed:
+        print(f"  ⚠️ {len(unparsed)} value(s) did not parse and were set to null "
+              f"(originals kept in *_legacy), e.g.:")
+        for _id, field, value in unparsed[:UNPARSED_EXAMPLES]:
+            print(f"     {_id} {field}={value!r}")
+
+    db["attendance"].create_index([("date", 1), ("status", 1)], background=True)
+
+
+def _normalize_user_emails(db):
+    """Lowercase stored login emails; login and signup now look them up lowercased"""
+    for user in db["users"].find(
+        {"$expr": {"$ne": ["$email", {"$toLower": "$email"}]}},
+        {"email": 1}
+    ):
+        try:
+            db["users"].update_one({"_id": user["_id"]}, {"$set": {"email": user["email"].strip().lower()}})
+        except DuplicateKeyError:
+            print(f"  ⚠️ {user['email']} differs only by case from another account; left unchanged")
+
+
+# (version, description, function) - append only, never renumber
+MIGRATIONS = [
+    (1, "Initial indexes", _initial_indexes),
+    (2, "Leave request status and history indexes", _leave_request_indexes),
+    (3, "Leave request status/_id pagination index", _leave_request_page_index),
+    (4, "Unique (employee_id, date) for working_hours and attendance", _unique_daily_records),
+    (5, "Sessions TTL index", _session_ttl_index),
+    (6, "Payroll snapshot (period, employee_id) index", _payroll_snapshot_index),
+    (7, "Case-insensitive employee search indexes", _employee_search_indexes),
+    (8, "Typed attendance check-in/check-out times and date index", _typed_attendance_times),
+    (9, "Lowercase user emails", _normalize_user_emails),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version() -> int:
+    """Return the highest applied migration version (0 if none)"""
+    latest = get_db()[MIGRATIONS_COL].find_one({}, sort=[("_id", -1)])
+    return latest["_id"] if latest else 0
+
+
+def run_migrations() -> int:
+    """
+    Apply all pending migrations in order
+
+    Returns:
+        Number of migrations applied
+    """
+    db = get_db()
+    current = get_schema_version()
+    applied = 0
+
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+
+        print(f"🔄 Applying migration {version}: {description}")
+        migrate(db)
+
+        try:
+            db[MIGRATIONS_COL].insert_one({
+                "_id": version,
+                "description": description,
+                "applied_at": datetime.now()
+            })
+        except DuplicateKeyError:
+            # Another runner recorded it first; the index builds are idempotent
+            pass
+
+        applied += 1
+        print(f"  ✓ Migration {version} applied")
+
+    return applied
+
+
+@lru_cache(maxsize=None)
+def check_schema() -> bool:
+    """
+    Check once per process that the database is fully migrated
+
+    Returns:
+        True if the recorded schema version is up to date
+    """
+    current = get_schema_version()
+    if current < LATEST_VERSION:
+        print(f"⚠️ Database schema is at version {current}, expected {LATEST_VERSION}. Run: python migrate.py")
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply Dayflow database migrations")
+    parser.add_argument("--status", action="store_true", help="show the current schema version and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        print(f"📋 Schema version: {get_schema_version()} (latest: {LATEST_VERSION})")
+    else:
+        count = run_migrations()
+        print(f"\n✅ {count} migration(s) applied, schema at version {LATEST_VERSION}\n")
@@ -5,16 +5,147 @@ Manage employees and approve/reject leave requests
 
 import streamlit as st
 import pandas as pd
+import io
 from datetime import datetime, timedelta
 import sys
 from pathlib import Path
+from pymongo import UpdateOne
 
 # Add parent directory to path to import modules from root
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from database import leave_requests_col, employees_col, users_col, attendance_col, working_hours_col
+from database import leave_requests_col, employees_col
+from analytics import working_hours_stats_by_employee, summarize_hours_records, punctuality_by_department, MIN_DAILY_HOURS, LATE_AFTER_MINUTES
+from attendance_service import format_time
+import daily_summary
+import employee_directory
+import bulk_import
+import query_profiler
+import reports
+import queries
+import metrics
 
-def show():
-    """Display admin dashboard"""
+# Dashboard sections (one is rendered per rerun)
+SECTIONS = [
+    "📈 Dashboard",
+    "📋 Leave Requests",
+    "👥 Employees",
+    "📊 Attendance",
+    "⏱️ Working Hours"
+]
+
+# Leave request list page sizes
+LEAVE_PAGE_SIZES = [10, 25, 50, 100]
+
+# Attendance / working hours tables render at most this many rows
+TABLE_ROW_LIMIT = 1000
+
+def employee_picker(label: str, key: str, multiple: bool = False) -> list:
+    """
+    Typeahead employee selector backed by employee_directory.search
+
+    Only one page of matches is sent to the browser; Previous/Next walk the
+    pages and, in multiple mode, selections are kept across searches.
+
+    Args:
+        label: Widget label
+        key: Widget key (also prefixes the search and paging state)
+        multiple: Multiselect instead of a single selectbox
+
+    Returns:
+        Selected employee IDs (at most one unless multiple)
+    """
+    term = st.text_input(
+        f"🔍 Search {label}",
+        placeholder="Employee ID, name or department (prefix)",
+        key=f"{key}_search"
+    )
+    
+    # Keyset pagination on employee_id; the stack holds each page's start key
+    if st.session_state.get(f"{key}_term") != term:
+        st.session_state[f"{key}_term"] = term
+        st.session_state[f"{key}_cursors"] = []
+    cursors = st.session_state[f"{key}_cursors"]
+    
+    matches, has_more = employee_directory.search(term, after=cursors[-1] if cursors else None)
+    labels = [f"{e['employee_id']} - {e.get('name', '-')}" for e in matches]
+    
+    if multiple:
+        # Keep earlier selections selectable after the search or page changes
+        if key not in st.session_state:
+            st.session_state[key] = labels[:1]
+        options = list(dict.fromkeys(st.session_state[key] + labels))
+        selected = st.multiselect(label, options=options, key=key)
+    else:
+        selected = [st.selectbox(label, options=labels, key=key)] if labels else []
+        if not labels:
+            st.info("No matching employees")
+    
+    if cursors or has_more:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("⬅️ Previous", disabled=not cursors, key=f"{key}_prev"):
+                cursors.pop()
+                st.rerun()
+        with col_page:
+            st.caption(f"Matches page {len(cursors) + 1}")
+        with col_next:
+            if st.button("Next ➡️", disabled=not has_more, key=f"{key}_next"):
+                cursors.append(matches[-1]["employee_id"])
+                st.rerun()
+    
+    return [label.split(" - ")[0] for label in selected]
+
+def pick_employee_ids(key: str) -> list:
+    """Selected employees, or every employee in one department"""
+    scope = st.radio("Filter By", ["Employees", "Department"], horizontal=True, key=f"{key}_scope")
+    if scope == "Department":
+        department = st.selectbox("Department", employee_directory.get_departments(), key=f"{key}_department")
+        return employee_directory.department_ids(department) if department else []
+    return employee_picker("Select Employees", key, multiple=True)
+
+def decide_leaves(leave_ids: list, status: str) -> dict:
+    """
+    Approve or reject many leave requests in one bulk_write
+
+    Each update only matches requests that are still pending, so a request
+    already processed by another admin is skipped rather than overwritten.
+
+    Args:
+        leave_ids: Leave request _ids
+        status: "approved" or "rejected"
+
+    Returns:
+        dict with requested, matched, modified and skipped counts
+    """
+    if not leave_ids:
+        return {"requested": 0, "matched": 0, "modified": 0, "skipped": 0}
+
+    result = leave_requests_col.bulk_write(
+        [
+            UpdateOne({"_id": leave_id, "status": "pending"}, {"$set": {"status": status}})
+            for leave_id in leave_ids
+        ],
+        ordered=False
+    )
+    if result.modified_count:
+        daily_summary.record_leave_decided(result.modified_count)
+        metrics.inc(f"leave_{status}", result.modified_count)
+
+    return {
+        "requested": len(leave_ids),
+        "matched": result.matched_count,
+        "modified": result.modified_count,
+        "skipped": len(leave_ids) - result.matched_count
+    }
+
+@metrics.timed_page("admin_dashboard")
+def show(initial_section: str = None):
+    """
+    Display admin dashboard
+    
+    Args:
+        initial_section: Section to open when arriving from the sidebar menu
+    """
     st.set_page_config(
         page_title="Admin Dashboard",
         page_icon="👨‍💼",
@@ -37,353 +168,545 @@ def show():
     st.markdown(f"**Logged in as:** {user['name']}")
     st.markdown("---")
     
-    # Tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "📈 Dashboard",
-        "📋 Leave Requests",
-        "👥 Employees",
-        "📊 Attendance",
-        "⏱️ Working Hours"
-    ])
+    # Section navigation: unlike st.tabs, only the selected section runs
+    if initial_section and st.session_state.get("admin_section_entry") != initial_section:
+        st.session_state.admin_section_entry = initial_section
+        st.session_state.admin_section = initial_section
+    section = st.radio(
+        "Section",
+        SECTIONS,
+        horizontal=True,
+        key="admin_section",
+        label_visibility="collapsed"
+    )
+    query_profiler.set_page("admin", section)
+    metrics.set_section(section)
+    st.markdown("---")
     
     # =========================================================
     # TAB 1: DASHBOARD
     # =========================================================
-    with tab1:
+    if section == "📈 Dashboard":
         st.subheader("📈 Dashboard Overview")
         
         col1, col2, col3, col4 = st.columns(4)
         
-        total_employees = 0
-        total_pending_leaves = 0
-        total_present_today = 0
-        total_absent_today = 0
-        
-        if employees_col is not None:
-            total_employees = employees_col.count_documents({})
-        
-        if leave_requests_col is not None:
-            total_pending_leaves = leave_requests_col.count_documents({"status": "pending"})
-        
         # ✅ FIX: Use datetime.datetime instead of datetime.date
         today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         
-        if attendance_col is not None:
-            today_records = list(attendance_col.find({
-                "date": today
-            }))
-            total_present_today = len([r for r in today_records if r["status"] == "present"])
-            total_absent_today = len([r for r in today_records if r["status"] == "absent"])
+        # All four tiles come from the maintained daily_summary rollup
+        overview = daily_summary.get_overview(today)
         
         with col1:
-            st.metric("👥 Total Employees", total_employees)
+            st.metric("👥 Total Employees", overview["total_employees"])
         with col2:
-            st.metric("⏳ Pending Leaves", total_pending_leaves)
+            st.metric("⏳ Pending Leaves", overview["pending_leaves"])
         with col3:
-            st.metric("✅ Present Today", total_present_today)
+            st.metric("✅ Present Today", overview["present"])
         with col4:
-            st.metric("❌ Absent Today", total_absent_today)
+            st.metric("❌ Absent Today", overview["absent"])
     
     # =========================================================
     # TAB 2: LEAVE REQUESTS
     # =========================================================
-    with tab2:
+    if section == "📋 Leave Requests":
         st.subheader("📋 Leave Requests Management")
         
-        if leave_requests_col is not None:
-            leaves = list(leave_requests_col.find({}))
-            
-            if leaves:
-                # Filter by status
-                status_filter = st.selectbox(
-                    "Filter by Status",
-                    ["All", "pending", "approved", "rejected"]
+        col_f, col_s = st.columns([3, 1])
+        with col_f:
+            # Filter by status (applied in the query, served by the status index)
+            status_filter = st.selectbox(
+                "Filter by Status",
+                ["All", "pending", "approved", "rejected"]
+            )
+        with col_s:
+            page_size = st.selectbox("Per Page", LEAVE_PAGE_SIZES, key="leave_page_size")
+        
+        # Keyset pagination on _id (newest first); the stack holds each page's start key
+        if st.session_state.get("leave_page_query") != (status_filter, page_size):
+            st.session_state.leave_page_query = (status_filter, page_size)
+            st.session_state.leave_page_cursors = []
+        cursors = st.session_state.leave_page_cursors
+        
+        query = {} if status_filter == "All" else {"status": status_filter}
+        if cursors:
+            query["_id"] = {"$lt": cursors[-1]}
+        
+        leaves = list(queries.find("leave_list", query, sort=[("_id", -1)], limit=page_size + 1))
+        has_next = len(leaves) > page_size
+        leaves = leaves[:page_size]
+        
+        # Result of the last bulk action survives the rerun that follows it
+        bulk_result = st.session_state.pop("leave_bulk_result", None)
+        if bulk_result:
+            st.success(
+                f"✅ {bulk_result['status'].capitalize()} {bulk_result['modified']} of "
+                f"{bulk_result['requested']} request(s) "
+                f"(matched: {bulk_result['matched']}, skipped: {bulk_result['skipped']})"
+            )
+        
+        pending_on_page = [l for l in leaves if l["status"] == "pending"]
+        if pending_on_page:
+            with st.expander(f"⚡ Bulk Actions ({len(pending_on_page)} pending on this page)"):
+                pending_labels = {
+                    f"{l['employee_id']} - {l['leave_type']} - {l['days']} day(s) - {l['_id']}": l["_id"]
+                    for l in pending_on_page
+                }
+                select_all = st.checkbox("Select all pending on this page", key="leave_bulk_all")
+                selected = st.multiselect(
+                    "Select Requests",
+                    options=list(pending_labels),
+                    default=list(pending_labels) if select_all else [],
+                    key=f"leave_bulk_select_{select_all}"
                 )
+                col_ba, col_br = st.columns(2)
+                bulk_status = None
+                with col_ba:
+                    if st.button("✅ Approve Selected", disabled=not selected, key="leave_bulk_approve"):
+                        bulk_status = "approved"
+                with col_br:
+                    if st.button("❌ Reject Selected", disabled=not selected, key="leave_bulk_reject"):
+                        bulk_status = "rejected"
                 
-                if status_filter != "All":
-                    leaves = [l for l in leaves if l["status"] == status_filter]
-                
-                for leave in leaves:
-                    with st.expander(
-                        f"{leave['leave_type'].upper()} - {leave['employee_id']} - {leave['status'].upper()}"
-                    ):
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.write(f"**Employee ID:** {leave['employee_id']}")
-                            st.write(f"**From:** {leave['start_date'].replace(hour=0, minute=0, second=0, microsecond=0)}")
-                            st.write(f"**To:** {leave['end_date'].replace(hour=0, minute=0, second=0, microsecond=0)}")
-                            st.write(f"**Days:** {leave['days']}")
-                            st.write(f"**Type:** {leave['leave_type'].capitalize()}")
-                            st.write(f"**Reason:** {leave['reason']}")
-                        
-                        with col2:
-                            if leave["status"] == "pending":
-                                col_a, col_r = st.columns(2)
-                                with col_a:
-                                    if st.button("✅ Approve", key=f"approve_{leave['_id']}"):
-                                        leave_requests_col.update_one(
-                                            {"_id": leave["_id"]},
-                                            {"$set": {"status": "approved"}}
-                                        )
-                                        st.success("✅ Leave approved!")
-                                        st.rerun()
-                                with col_r:
-                                    if st.button("❌ Reject", key=f"reject_{leave['_id']}"):
-                                        leave_requests_col.update_one(
-                                            {"_id": leave["_id"]},
-                                            {"$set": {"status": "rejected"}}
-                                        )
-                                        st.error("❌ Leave rejected!")
-                                        st.rerun()
-                            else:
-                                st.write(f"**Status:** {leave['status'].upper()}")
-            else:
-                st.info("No leave requests found")
+                if bulk_status:
+                    bulk_result = decide_leaves([pending_labels[label] for label in selected], bulk_status)
+                    bulk_result["status"] = bulk_status
+                    st.session_state.leave_bulk_result = bulk_result
+                    st.rerun()
+        
+        if leaves:
+            for leave in leaves:
+                with st.expander(
+                    f"{leave['leave_type'].upper()} - {leave['employee_id']} - {leave['status'].upper()}"
+                ):
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        st.write(f"**Employee ID:** {leave['employee_id']}")
+                        st.write(f"**From:** {leave['start_date'].replace(hour=0, minute=0, second=0, microsecond=0)}")
+                        st.write(f"**To:** {leave['end_date'].replace(hour=0, minute=0, second=0, microsecond=0)}")
+                        st.write(f"**Days:** {leave['days']}")
+                        st.write(f"**Type:** {leave['leave_type'].capitalize()}")
+                        st.write(f"**Reason:** {leave['reason']}")
+                    
+                    with col2:
+                        if leave["status"] == "pending":
+                            col_a, col_r = st.columns(2)
+                            with col_a:
+                                if st.button("✅ Approve", key=f"approve_{leave['_id']}"):
+                                    decide_leaves([leave["_id"]], "approved")
+                                    st.success("✅ Leave approved!")
+                                    st.rerun()
+                            with col_r:
+                                if st.button("❌ Reject", key=f"reject_{leave['_id']}"):
+                                    decide_leaves([leave["_id"]], "rejected")
+                                    st.error("❌ Leave rejected!")
+                                    st.rerun()
+                        else:
+                            st.write(f"**Status:** {leave['status'].upper()}")
+            
+            # Pagination controls
+            col_prev, col_page, col_next = st.columns([1, 2, 1])
+            with col_prev:
+                if st.button("⬅️ Previous", disabled=not cursors, key="leave_prev"):
+                    cursors.pop()
+                    st.rerun()
+            with col_page:
+                st.caption(f"Page {len(cursors) + 1}")
+            with col_next:
+                if st.button("Next ➡️", disabled=not has_next, key="leave_next"):
+                    cursors.append(leaves[-1]["_id"])
+                    st.rerun()
+        else:
+            st.info("No leave requests found")
     
     # =========================================================
     # TAB 3: EMPLOYEES
     # =========================================================
-    with tab3:
+    if section == "👥 Employees":
         st.subheader("👥 Manage Employees")
         
-        if employees_col is not None and users_col is not None:
-            employees = list(employees_col.find({}))
-            
-            if employees:
-                # Dropdown to select employee
-                selected_emp_label = st.selectbox(
-                    "Select Employee",
-                    options=[f"{e['employee_id']} - {e['name']}" for e in employees],
-                    key="admin_emp_select"
-                )
-                emp_id = selected_emp_label.split(" - ")[0]
-                emp = employees_col.find_one({"employee_id": emp_id})
+        selected_ids = employee_picker("Select Employee", "admin_emp_select")
+        
+        if selected_ids:
+            emp_id = selected_ids[0]
+            emp = queries.find_one("employee_profile", {"employee_id": emp_id})
 
-                if emp:
-                    st.markdown("### 🧾 Full Employee Details (Admin Editable)")
-                    col1, col2 = st.columns(2)
+            if emp:
+                st.markdown("### 🧾 Full Employee Details (Admin Editable)")
+                col1, col2 = st.columns(2)
 
-                    # LEFT: personal & contact
-                    with col1:
-                        st.markdown("#### 👤 Personal & Contact")
-                        name = st.text_input("Name", value=emp.get("name",""), key="adm_name")
-                        department = st.text_input("Department", value=emp.get("department",""), key="adm_dept")
-                        designation = st.text_input("Designation", value=emp.get("designation",""), key="adm_desig")
+                # LEFT: personal & contact
+                with col1:
+                    st.markdown("#### 👤 Personal & Contact")
+                    name = st.text_input("Name", value=emp.get("name",""), key="adm_name")
+                    department = st.text_input("Department", value=emp.get("department",""), key="adm_dept")
+                    designation = st.text_input("Designation", value=emp.get("designation",""), key="adm_desig")
 
-                        contact = emp.get("contact", {})
-                        email = st.text_input("Email", value=contact.get("email",""), key="adm_email")
-                        phone = st.text_input("Phone", value=contact.get("phone",""), key="adm_phone")
-                        address = st.text_area("Address", value=contact.get("address",""), key="adm_address", height=80)
+                    contact = emp.get("contact", {})
+                    email = st.text_input("Email", value=contact.get("email",""), key="adm_email")
+                    phone = st.text_input("Phone", value=contact.get("phone",""), key="adm_phone")
+                    address = st.text_area("Address", value=contact.get("address",""), key="adm_address", height=80)
 
-                        profile_picture = st.text_input(
-                            "Profile Picture URL",
-                            value=emp.get("profile_picture",""),
-                            key="adm_profile_pic"
-                        )
+                    profile_picture = st.text_input(
+                        "Profile Picture URL",
+                        value=emp.get("profile_picture",""),
+                        key="adm_profile_pic"
+                    )
 
-                    # RIGHT: job, salary, documents
-                    with col2:
-                        st.markdown("#### 💼 Job Details")
-                        job = emp.get("job_details", {})
-                        employment_type = st.text_input(
-                            "Employment Type",
-                            value=job.get("employment_type",""),
-                            key="adm_emp_type"
-                        )
-                        manager = st.text_input(
-                            "Manager",
-                            value=job.get("manager",""),
-                            key="adm_manager"
-                        )
-                        joining_date_str = st.text_input(
-                            "Joining Date (YYYY-MM-DD)",
-                            value=str(job.get("joining_date","")),
-                            key="adm_joining_date"
-                        )
+                # RIGHT: job, salary, documents
+                with col2:
+                    st.markdown("#### 💼 Job Details")
+                    job = emp.get("job_details", {})
+                    employment_type = st.text_input(
+                        "Employment Type",
+                        value=job.get("employment_type",""),
+                        key="adm_emp_type"
+                    )
+                    manager = st.text_input(
+                        "Manager",
+                        value=job.get("manager",""),
+                        key="adm_manager"
+                    )
+                    joining_date_str = st.text_input(
+                        "Joining Date (YYYY-MM-DD)",
+                        value=str(job.get("joining_date","")),
+                        key="adm_joining_date"
+                    )
 
-                        st.markdown("#### 💰 Salary Structure")
-                        salary = emp.get("salary_structure", {})
-                        basic = st.number_input("Basic", value=float(salary.get("basic",0)), step=1000.0, key="adm_basic")
-                        hra = st.number_input("HRA", value=float(salary.get("hra",0)), step=1000.0, key="adm_hra")
-                        allowances = st.number_input("Allowances", value=float(salary.get("allowances",0)), step=1000.0, key="adm_allow")
-                        deductions = st.number_input("Deductions", value=float(salary.get("deductions",0)), step=1000.0, key="adm_deduct")
+                    st.markdown("#### 💰 Salary Structure")
+                    salary = emp.get("salary_structure", {})
+                    basic = st.number_input("Basic", value=float(salary.get("basic",0)), step=1000.0, key="adm_basic")
+                    hra = st.number_input("HRA", value=float(salary.get("hra",0)), step=1000.0, key="adm_hra")
+                    allowances = st.number_input("Allowances", value=float(salary.get("allowances",0)), step=1000.0, key="adm_allow")
+                    deductions = st.number_input("Deductions", value=float(salary.get("deductions",0)), step=1000.0, key="adm_deduct")
 
-                        st.markdown("#### 📂 Documents (view only in UI)")
-                        docs = emp.get("documents", [])
-                        if docs:
-                            for d in docs:
-                                st.write(f"- [{d.get('title','Document')}]({d.get('url','#')}) ({d.get('type','')})")
-                        else:
-                            st.write("No documents.")
+                    st.markdown("#### 📂 Documents (view only in UI)")
+                    docs = emp.get("documents", [])
+                    if docs:
+                        for d in docs:
+                            st.write(f"- [{d.get('title','Document')}]({d.get('url','#')}) ({d.get('type','')})")
+                    else:
+                        st.write("No documents.")
 
-                    # Save button
-                    if st.button("💾 Save All Changes", key="adm_emp_save"):
-                        try:
-                            update_doc = {
-                                "name": name,
-                                "department": department,
-                                "designation": designation,
-                                "contact.email": email,
-                                "contact.phone": phone,
-                                "contact.address": address,
-                                "profile_picture": profile_picture,
-                                "job_details.employment_type": employment_type,
-                                "job_details.manager": manager,
-                                "salary_structure.basic": basic,
-                                "salary_structure.hra": hra,
-                                "salary_structure.allowances": allowances,
-                                "salary_structure.deductions": deductions
-                            }
-                            
-                            if joining_date_str:
-                                try:
-                                    update_doc["job_details.joining_date"] = datetime.strptime(joining_date_str, "%Y-%m-%d")
-                                except ValueError:
-                                    st.warning("⚠️ Joining date format invalid, skipping update for that field.")
+                # Save button
+                if st.button("💾 Save All Changes", key="adm_emp_save"):
+                    try:
+                        update_doc = {
+                            "name": name,
+                            "department": department,
+                            "designation": designation,
+                            "contact.email": email,
+                            "contact.phone": phone,
+                            "contact.address": address,
+                            "profile_picture": profile_picture,
+                            "job_details.employment_type": employment_type,
+                            "job_details.manager": manager,
+                            "salary_structure.basic": basic,
+                            "salary_structure.hra": hra,
+                            "salary_structure.allowances": allowances,
+                            "salary_structure.deductions": deductions
+                        }
+                        
+                        if joining_date_str:
+                            try:
+                                update_doc["job_details.joining_date"] = datetime.strptime(joining_date_str, "%Y-%m-%d")
+                            except ValueError:
+                                st.warning("⚠️ Joining date format invalid, skipping update for that field.")
 
-                            employees_col.update_one(
-                                {"employee_id": emp_id},
-                                {"$set": update_doc}
-                            )
-                            st.success("✅ Employee details updated successfully!")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"❌ Error updating employee: {e}")
-            else:
-                st.info("👥 No employees found")
+                        employees_col.update_one(
+                            {"employee_id": emp_id},
+                            {"$set": update_doc}
+                        )
+                        employee_directory.invalidate()
+                        st.success("✅ Employee details updated successfully!")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"❌ Error updating employee: {e}")
     
     # =========================================================
     # TAB 4: ATTENDANCE
     # =========================================================
-    with tab4:
+    if section == "📊 Attendance":
         st.subheader("📊 Attendance Records")
         
-        if attendance_col is not None and employees_col is not None:
-            # Date range filter
-            col1, col2 = st.columns(2)
-            with col1:
-                start_date = st.date_input("From Date", datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=30), key="att_start_admin")
-            with col2:
-                end_date = st.date_input("To Date", datetime.now().replace(hour=0, minute=0, second=0, microsecond=0), key="att_end_admin")
+        # Date range filter
+        col1, col2 = st.columns(2)
+        with col1:
+            start_date = st.date_input("From Date", datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=30), key="att_start_admin")
+        with col2:
+            end_date = st.date_input("To Date", datetime.now().replace(hour=0, minute=0, second=0, microsecond=0), key="att_end_admin")
+        
+        # ✅ FIX: Convert date to datetime.datetime
+        start_dt = datetime(start_date.year, start_date.month, start_date.day)
+        end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59)
+        
+        # Filter by employees or a whole department
+        emp_ids = pick_employee_ids("att_emp_filter")
+        
+        if emp_ids:
+            emp_names = employee_directory.get_names()
             
-            # ✅ FIX: Convert date to datetime.datetime
-            start_dt = datetime(start_date.year, start_date.month, start_date.day)
-            end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59)
+            # One query for all selected employees; names come from the directory cache
+            records = list(queries.find("attendance_table", {
+                "employee_id": {"$in": emp_ids},
+                "date": {"$gte": start_dt, "$lte": end_dt}
+            }, sort=[("employee_id", 1), ("date", -1)], limit=TABLE_ROW_LIMIT + 1))
+            if len(records) > TABLE_ROW_LIMIT:
+                records = records[:TABLE_ROW_LIMIT]
+                st.caption(f"Showing the first {TABLE_ROW_LIMIT} records - use 📊 Reports for a full export")
             
-            # Get all employees for filter
-            employees = list(employees_col.find({}))
-            emp_filter = st.multiselect(
-                "Select Employees",
-                options=[f"{e['employee_id']} - {e['name']}" for e in employees],
-                default=[f"{employees[0]['employee_id']} - {employees[0]['name']}"] if employees else [],
-                key="att_emp_filter"
-            )
+            all_records = []
+            for r in records:
+                all_records.append({
+                    "Employee ID": r["employee_id"],
+                    "Employee Name": emp_names.get(r["employee_id"], "-"),
+                    "Date": r["date"].strftime("%Y-%m-%d"),
+                    "Status": r["status"].upper(),
+                    "Check In": format_time(r.get("check_in")),
+                    "Check Out": format_time(r.get("check_out")),
+                    "Hours": f"{r.get('working_hours', 0):.2f}" if r.get('working_hours') else "-"
+                })
             
-            if emp_filter:
-                emp_ids = [e.split(" - ")[0] for e in emp_filter]
-                
-                all_records = []
-                for emp_id in emp_ids:
-                    records = list(attendance_col.find({
-                        "employee_id": emp_id,
-                        "date": {"$gte": start_dt, "$lte": end_dt}
-                    }).sort("date", -1))
-                    
-                    for r in records:
-                        emp_data = employees_col.find_one({"employee_id": emp_id})
-                        all_records.append({
-                            "Employee ID": emp_id,
-                            "Employee Name": emp_data["name"] if emp_data else "-",
-                            "Date": r["date"].strftime("%Y-%m-%d"),
-                            "Status": r["status"].upper(),
-                            "Check In": r.get("check_in", "-"),
-                            "Check Out": r.get("check_out", "-"),
-                            "Hours": f"{r.get('working_hours', 0):.2f}" if r.get('working_hours') else "-"
-                        })
-                
-                if all_records:
-                    df = pd.DataFrame(all_records)
-                    st.dataframe(df, use_container_width=True, hide_index=True)
+            if all_records:
+                df = pd.DataFrame(all_records)
+                st.dataframe(df, use_container_width=True, hide_index=True)
+            else:
+                st.info("No attendance records found")
+        
+            # Punctuality of the selected employees, on request; the result is kept for
+            # this date range and selection, so search keystrokes and page clicks reuse it
+            st.markdown("---")
+            if st.checkbox(
+                f"⏰ Punctuality by Department (late after {LATE_AFTER_MINUTES // 60:02d}:{LATE_AFTER_MINUTES % 60:02d})",
+                key="att_show_punctuality"
+            ):
+                punctuality_key = (start_dt, end_dt, tuple(sorted(emp_ids)))
+                cached = st.session_state.get("att_punctuality")
+                if cached is None or cached[0] != punctuality_key:
+                    cached = (punctuality_key, punctuality_by_department(start_dt, end_dt, emp_ids))
+                    st.session_state.att_punctuality = cached
+                punctuality = cached[1]
+                if punctuality:
+                    st.dataframe(pd.DataFrame([
+                        {
+                            "Department": p["department"],
+                            "Employees": p["employees"],
+                            "Present Days": p["days"],
+                            "Late Arrivals": p["late"],
+                            "Late %": f"{p['late_pct']:.1f}",
+                            "Avg Start": f"{int(p['avg_start_minutes']) // 60:02d}:{int(p['avg_start_minutes']) % 60:02d}"
+                        }
+                        for p in punctuality
+                    ]), use_container_width=True, hide_index=True)
                 else:
-                    st.info("No attendance records found")
+                    st.info("No check-in times recorded for this period")
+            else:
+                # Unticking drops the kept result, so ticking again recomputes it
+                st.session_state.pop("att_punctuality", None)
     
     # =========================================================
     # TAB 5: WORKING HOURS
     # =========================================================
-    with tab5:
+    if section == "⏱️ Working Hours":
         st.subheader("⏱️ Working Hours Tracking")
         
-        if employees_col is not None and working_hours_col is not None:
-            employees = list(employees_col.find({}))
+        # Date range filter
+        col1, col2 = st.columns(2)
+        with col1:
+            start_date = st.date_input("From Date", datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=30), key="wh_start_admin")
+        with col2:
+            end_date = st.date_input("To Date", datetime.now().replace(hour=0, minute=0, second=0, microsecond=0), key="wh_end_admin")
+        
+        # ✅ FIX: Convert date to datetime.datetime
+        start_dt = datetime(start_date.year, start_date.month, start_date.day)
+        end_dt = datetime(end_date.year, end_date.month, end_date.day)
+        
+        # Filter by employees or a whole department
+        emp_ids = pick_employee_ids("wh_emp_filter_admin")
+        
+        if emp_ids:
+            emp_names = employee_directory.get_names()
             
-            if employees:
-                # Date range filter
-                col1, col2 = st.columns(2)
-                with col1:
-                    start_date = st.date_input("From Date", datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=30), key="wh_start_admin")
-                with col2:
-                    end_date = st.date_input("To Date", datetime.now().replace(hour=0, minute=0, second=0, microsecond=0), key="wh_end_admin")
+            # One query for all selected employees; names come from the directory cache
+            records = list(queries.find("working_hours_table", {
+                "employee_id": {"$in": emp_ids},
+                "date": {"$gte": start_dt, "$lte": end_dt}
+            }, sort=[("employee_id", 1), ("date", -1)], limit=TABLE_ROW_LIMIT + 1))
+            truncated = len(records) > TABLE_ROW_LIMIT
+            if truncated:
+                records = records[:TABLE_ROW_LIMIT]
+                st.caption(f"Showing the first {TABLE_ROW_LIMIT} records - use 📊 Reports for a full export")
+            
+            all_hours = []
+            for r in records:
+                all_hours.append({
+                    "Employee ID": r["employee_id"],
+                    "Employee Name": emp_names.get(r["employee_id"], "-"),
+                    "Date": r["date"].strftime("%Y-%m-%d"),
+                    "Check In": format_time(r.get("check_in")),
+                    "Check Out": format_time(r.get("check_out")),
+                    "Working Hours": f"{r.get('working_hours', 0):.2f}",
+                    "Status": r.get("status", "-").upper()
+                })
+            
+            if all_hours:
+                df = pd.DataFrame(all_hours)
+                st.dataframe(df, use_container_width=True, hide_index=True)
                 
-                # ✅ FIX: Convert date to datetime.datetime
-                start_dt = datetime(start_date.year, start_date.month, start_date.day)
-                end_dt = datetime(end_date.year, end_date.month, end_date.day)
+                # Summary statistics
+                st.markdown("---")
+                st.markdown("### 📊 Summary Statistics")
+                col1, col2, col3 = st.columns(3)
                 
-                # Filter by employee
-                emp_filter = st.multiselect(
-                    "Select Employees",
-                    options=[f"{e['employee_id']} - {e['name']}" for e in employees],
-                    default=[f"{employees[0]['employee_id']} - {employees[0]['name']}"] if employees else [],
-                    key="wh_emp_filter_admin"
-                )
+                # The fetched rows cover the whole range unless the table was capped;
+                # only then are the totals grouped in MongoDB
+                if truncated:
+                    emp_stats = working_hours_stats_by_employee(emp_ids, start_dt, end_dt)
+                else:
+                    emp_stats = summarize_hours_records(records)
+                total_hours = sum(s["total_hours"] for s in emp_stats.values())
+                total_days = sum(s["days"] for s in emp_stats.values())
+                avg_hours = total_hours / total_days if total_days else 0
+                checked_out = sum(s["checked_out"] for s in emp_stats.values())
                 
-                if emp_filter:
-                    emp_ids = [e.split(" - ")[0] for e in emp_filter]
-                    
-                    all_hours = []
-                    for emp_id in emp_ids:
-                        records = list(working_hours_col.find({
-                            "employee_id": emp_id,
-                            "date": {"$gte": start_dt, "$lte": end_dt}
-                        }).sort("date", -1))
-                        
-                        for r in records:
-                            emp_name = employees_col.find_one({"employee_id": emp_id})
-                            all_hours.append({
-                                "Employee ID": emp_id,
-                                "Employee Name": emp_name["name"] if emp_name else "-",
-                                "Date": r["date"].strftime("%Y-%m-%d"),
-                                "Check In": r.get("check_in", "-"),
-                                "Check Out": r.get("check_out", "-"),
-                                "Working Hours": f"{r.get('working_hours', 0):.2f}",
-                                "Status": r.get("status", "-").upper()
-                            })
-                    
-                    if all_hours:
-                        df = pd.DataFrame(all_hours)
-                        st.dataframe(df, use_container_width=True, hide_index=True)
-                        
-                        # Summary statistics
-                        st.markdown("---")
-                        st.markdown("### 📊 Summary Statistics")
-                        col1, col2, col3 = st.columns(3)
-                        
-                        total_hours = sum(float(r["Working Hours"]) for r in all_hours)
-                        avg_hours = total_hours / len(all_hours) if all_hours else 0
-                        checked_out = len([r for r in all_hours if r["Status"] == "CHECKED_OUT"])
-                        
-                        with col1:
-                            st.metric("Total Hours", f"{total_hours:.2f}")
-                        with col2:
-                            st.metric("Average Hours/Day", f"{avg_hours:.2f}")
-                        with col3:
-                            st.metric("Days Tracked", checked_out)
-                    else:
-                        st.info("No working hours records found for selected period")
+                with col1:
+                    st.metric("Total Hours", f"{total_hours:.2f}")
+                with col2:
+                    st.metric("Average Hours/Day", f"{avg_hours:.2f}")
+                with col3:
+                    st.metric("Days Tracked", checked_out)
+                
+                if len(emp_stats) > 1:
+                    st.dataframe(pd.DataFrame([
+                        {
+                            "Employee ID": emp_id,
+                            "Employee Name": emp_names.get(emp_id, "-"),
+                            "Total Hours": f"{s['total_hours']:.2f}",
+                            "Average/Day": f"{s['avg_hours']:.2f}",
+                            "Days Tracked": s["checked_out"],
+                            f"Below {MIN_DAILY_HOURS}hrs": s["below_min"]
+                        }
+                        for emp_id, s in emp_stats.items()
+                    ]), use_container_width=True, hide_index=True)
+            else:
+                st.info("No working hours records found for selected period")
+
+@metrics.timed_page("manage_users")
+def show_manage_users():
+    """Bulk onboarding: import users and employee profiles from CSV"""
+    user = st.session_state.get("user") or {}
+    if user.get("role") != "admin":
+        st.error("❌ Access Denied! Only admins can access this page.")
+        st.stop()
+    
+    st.markdown("# 👥 Manage Users")
+    st.markdown("---")
+    st.subheader("📥 Bulk Import (CSV)")
+    st.caption(
+        "Required columns: " + ", ".join(bulk_import.REQUIRED_COLUMNS) +
+        ". Optional: role, department, designation, employment_type, manager, "
+        "joining_date (YYYY-MM-DD), phone, address, basic, hra, allowances, deductions."
+    )
+    
+    uploaded = st.file_uploader("CSV file", type=["csv"], key="bulk_import_file")
+    
+    if uploaded is not None and st.button("📥 Import", type="primary", key="bulk_import_btn"):
+        with st.spinner("Importing..."):
+            summary = bulk_import.import_users(io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline=""))
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Rows Read", summary["rows"])
+        with col2:
+            st.metric("Users Created", summary["users"])
+        with col3:
+            st.metric("Profiles Created", summary["employees"])
+        
+        if summary["failed"]:
+            st.error(f"❌ {len(summary['failed'])} row(s) failed")
+            st.dataframe(
+                pd.DataFrame(summary["failed"], columns=["CSV Line", "Reason"]),
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.success(f"✅ Import finished in {summary['seconds']:.1f}s")
+
+@metrics.timed_page("reports")
+def show_reports():
+    """Reports: stream attendance, working hours and leave exports as downloads"""
+    user = st.session_state.get("user") or {}
+    if user.get("role") != "admin":
+        st.error("❌ Access Denied! Only admins can access this page.")
+        st.stop()
+    
+    st.markdown("# 📊 Reports")
+    st.markdown("---")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        report = st.selectbox(
+            "Report",
+            list(reports.REPORTS),
+            format_func=lambda r: r.replace("_", " ").title(),
+            key="report_name"
+        )
+        start_date = st.date_input("From Date", datetime.now() - timedelta(days=30), key="report_start")
+        end_date = st.date_input("To Date", datetime.now(), key="report_end")
+    with col2:
+        fmt = st.radio("Format", list(reports.FORMATS), format_func=str.upper, horizontal=True, key="report_format")
+        scope = st.radio("Employees", ["All", "Department", "Selected"], horizontal=True, key="report_scope")
+        
+        employee_ids = None
+        if scope == "Department":
+            department = st.selectbox("Department", employee_directory.get_departments(), key="report_department")
+            employee_ids = employee_directory.department_ids(department) if department else []
+        elif scope == "Selected":
+            employee_ids = employee_picker("Select Employees", "report_employees", multiple=True)
+    
+    start_dt = datetime(start_date.year, start_date.month, start_date.day)
+    end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59)
+    
+    # The export runs only when the button is clicked, on a separate thread
+    st.download_button(
+        "⬇️ Download",
+        data=lambda: reports.export_to_file(report, fmt, start_dt, end_dt, employee_ids),
+        file_name=f"{report}_{start_date}_{end_date}.{fmt}",
+        mime=reports.FORMATS[fmt],
+        type="primary",
+        disabled=employee_ids == [],
+        key="report_download"
+    )
+    st.caption("Large or scheduled exports: `python reports.py --help`")
+
+def show_query_profile(profile):
+    """Admin debug panel: MongoDB commands issued by the current rerun"""
+    if profile is None:
+        return
+    
+    summary = profile.summary()
+    with st.expander(f"🐞 Query Profiler - {summary['commands']} queries, {summary['ms']:.1f} ms", expanded=True):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Round Trips", summary["commands"])
+        with col2:
+            st.metric("Mongo Time", f"{summary['ms']:.1f} ms")
+        with col3:
+            st.metric("Docs Returned", summary["docs"])
+        with col4:
+            st.metric("Rerun Time", f"{summary['rerun_ms']:.0f} ms")
+        
+        if summary["by_tag"]:
+            st.dataframe(pd.DataFrame(summary["by_tag"]), use_container_width=True, hide_index=True)
+        
+        if summary["slow"]:
+            st.markdown(f"**Slow queries (≥ {query_profiler.SLOW_QUERY_MS:.0f} ms)**")
+            st.dataframe(pd.DataFrame(summary["slow"]), use_container_width=True, hide_index=True)
 
 def show_leave_requests():
     """Show leave requests management"""
-    show()
+    show(initial_section="📋 Leave Requests")
 
 if __name__ == "__main__":
     show()
\ No newline at end of file
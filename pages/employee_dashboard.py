@@ -11,8 +11,28 @@ from pathlib import Path
 
 # Add parent directory to path to import modules from root
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from database import employees_col, attendance_col, leave_requests_col, working_hours_col
+from database import employees_col, leave_requests_col
+from analytics import summarize_hours_records, employee_overview, MIN_DAILY_HOURS
+from attendance_service import format_time
+import daily_summary
+import employee_directory
+import query_profiler
+import queries
+import metrics
 
+# Dashboard sections (one is rendered per rerun)
+SECTIONS = [
+    "📈 Overview",
+    "👤 Profile",
+    "📋 Attendance",
+    "📅 Leave",
+    "⏱️ Working Hours"
+]
+
+# Leave form options; "Unpaid Leave" is deducted by payroll (see payroll.UNPAID_LEAVE_TYPES)
+LEAVE_TYPES = ["Sick Leave", "Casual Leave", "Earned Leave", "Maternity Leave", "Unpaid Leave", "Other"]
+
+@metrics.timed_page("employee_dashboard")
 def show():
     """Display employee dashboard"""
     
@@ -28,97 +48,51 @@ def show():
     st.markdown(f"**Welcome, {user['name']}!**")
     st.markdown("---")
     
-    # Get employee details
-    if employees_col is None:
-        st.error("❌ Database connection failed")
-        return
-    
-    employee = employees_col.find_one({"employee_id": employee_id})
-    
-    if not employee:
-        st.error("❌ Employee record not found")
-        return
+    # Section navigation: unlike st.tabs, only the selected section runs
+    section = st.radio(
+        "Section",
+        SECTIONS,
+        horizontal=True,
+        key="employee_section",
+        label_visibility="collapsed"
+    )
+    query_profiler.set_page("employee", section)
+    metrics.set_section(section)
+    st.markdown("---")
     
-    # Tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "📈 Overview",
-        "👤 Profile",
-        "📋 Attendance",
-        "📅 Leave",
-        "⏱️ Working Hours"
-    ])
+    if section in ("📈 Overview", "👤 Profile"):
+        # Profile and all overview metrics in a single aggregation
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        view = "employee_summary" if section == "📈 Overview" else "employee_profile"
+        overview = employee_overview(employee_id, today, queries.projection(view))
+        
+        if not overview:
+            st.error("❌ Employee record not found")
+            return
+        
+        employee = overview["employee"]
     
     # =========================================================
     # TAB 1: OVERVIEW / DASHBOARD
     # =========================================================
-    with tab1:
+    if section == "📈 Overview":
         st.subheader("📈 Dashboard Overview")
         
         col1, col2, col3, col4 = st.columns(4)
         
-        # Calculate metrics
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        # Today's status
-        today_attendance = None
-        if attendance_col is not None:
-            today_attendance = attendance_col.find_one({
-                "employee_id": employee_id,
-                "date": today
-            })
-        
-        today_status = "Not Marked" if not today_attendance else today_attendance.get("status", "Unknown").upper()
-        today_hours = 0
-        
-        # Today's working hours
-        if working_hours_col is not None:
-            today_record = working_hours_col.find_one({
-                "employee_id": employee_id,
-                "date": today
-            })
-            if today_record:
-                today_hours = today_record.get("working_hours", 0)
-                check_in = today_record.get("check_in")
-                check_out = today_record.get("check_out")
-                
-                if check_in and not check_out:
-                    # Currently checked in - calculate live hours
-                    current_time = datetime.now()
-                    today_hours = (current_time - check_in).total_seconds() / 3600
-        
         with col1:
-            st.metric("📋 Today's Status", today_status)
+            st.metric("📋 Today's Status", overview["today_status"])
         with col2:
-            st.metric("⏱️ Today's Hours", f"{today_hours:.2f} hrs")
-        
-        # This week's hours
-        week_start = today - timedelta(days=today.weekday())
-        weekly_hours = 0
-        if working_hours_col is not None:
-            week_records = list(working_hours_col.find({
-                "employee_id": employee_id,
-                "date": {"$gte": week_start}
-            }))
-            weekly_hours = sum(r.get("working_hours", 0) for r in week_records)
-        
+            st.metric("⏱️ Today's Hours", f"{overview['today_hours']:.2f} hrs")
         with col3:
-            st.metric("📅 This Week", f"{weekly_hours:.2f} hrs")
-        
-        # Pending leaves
-        pending_leaves = 0
-        if leave_requests_col is not None:
-            pending_leaves = leave_requests_col.count_documents({
-                "employee_id": employee_id,
-                "status": "pending"
-            })
-        
+            st.metric("📅 This Week", f"{overview['week_hours']:.2f} hrs")
         with col4:
-            st.metric("⏳ Pending Leaves", pending_leaves)
+            st.metric("⏳ Pending Leaves", overview["pending_leaves"])
     
     # =========================================================
     # TAB 2: PROFILE (WITH EDIT FUNCTIONALITY)
     # =========================================================
-    with tab2:
+    if section == "👤 Profile":
         st.subheader("👤 Employee Profile")
         
         # Check if we're in edit mode
@@ -204,6 +178,7 @@ def show():
                         {"employee_id": employee_id},
                         {"$set": update_doc}
                     )
+                    employee_directory.invalidate()
                     st.success("✅ Profile updated successfully!")
                     st.rerun()
                 except Exception as e:
@@ -274,40 +249,17 @@ def show():
             st.markdown("### 📊 Working Hours Summary")
             col_wh1, col_wh2, col_wh3 = st.columns(3)
             
-            # Calculate weekly and monthly working hours
-            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            week_start = today - timedelta(days=today.weekday())
-            month_start = today.replace(day=1)
-            
-            weekly_hours = 0
-            monthly_hours = 0
-            
-            if working_hours_col is not None:
-                # Weekly hours
-                week_records = list(working_hours_col.find({
-                    "employee_id": employee_id,
-                    "date": {"$gte": week_start}
-                }))
-                weekly_hours = sum(r.get("working_hours", 0) for r in week_records)
-                
-                # Monthly hours
-                month_records = list(working_hours_col.find({
-                    "employee_id": employee_id,
-                    "date": {"$gte": month_start}
-                }))
-                monthly_hours = sum(r.get("working_hours", 0) for r in month_records)
-            
             with col_wh1:
-                st.metric("📅 This Week", f"{weekly_hours:.2f} hrs")
+                st.metric("📅 This Week", f"{overview['week_hours']:.2f} hrs")
             with col_wh2:
-                st.metric("📆 This Month", f"{monthly_hours:.2f} hrs")
+                st.metric("📆 This Month", f"{overview['month_hours']:.2f} hrs")
             with col_wh3:
-                st.metric("⏱️ Daily Target", "6 hrs")
+                st.metric("⏱️ Daily Target", f"{MIN_DAILY_HOURS} hrs")
     
     # =========================================================
     # TAB 3: ATTENDANCE
     # =========================================================
-    with tab3:
+    if section == "📋 Attendance":
         st.subheader("📋 Attendance Records")
         
         # Date range filter
@@ -317,59 +269,55 @@ def show():
         with col2:
             end_date = st.date_input("To Date", datetime.now().replace(hour=0, minute=0, second=0, microsecond=0), key="att_end")
         
-        if attendance_col is not None:
-            # ✅ FIX: Use datetime.datetime for database queries
-            start_dt = datetime(start_date.year, start_date.month, start_date.day)
-            end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59)
+        # ✅ FIX: Use datetime.datetime for database queries
+        start_dt = datetime(start_date.year, start_date.month, start_date.day)
+        end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59)
+        
+        records = list(queries.find("attendance_table", {
+            "employee_id": employee_id,
+            "date": {"$gte": start_dt, "$lte": end_dt}
+        }, sort=[("date", -1)]))
+        
+        if records:
+            df = pd.DataFrame([
+                {
+                    "Date": r["date"].strftime("%Y-%m-%d"),
+                    "Status": "✅ Present" if r["status"] == "present" else "❌ Absent",
+                    "Check In": format_time(r.get("check_in")),
+                    "Check Out": format_time(r.get("check_out")),
+                    "Hours": f"{r.get('working_hours', 0):.2f}" if r.get('working_hours') else "-"
+                }
+                for r in records
+            ])
             
-            records = list(attendance_col.find({
-                "employee_id": employee_id,
-                "date": {"$gte": start_dt, "$lte": end_dt}
-            }).sort("date", -1))
+            st.dataframe(df, use_container_width=True, hide_index=True)
             
-            if records:
-                df = pd.DataFrame([
-                    {
-                        "Date": r["date"].strftime("%Y-%m-%d"),
-                        "Status": "✅ Present" if r["status"] == "present" else "❌ Absent",
-                        "Check In": r.get("check_in", "-"),
-                        "Check Out": r.get("check_out", "-"),
-                        "Hours": f"{r.get('working_hours', 0):.2f}" if r.get('working_hours') else "-"
-                    }
-                    for r in records
-                ])
-                
-                st.dataframe(df, use_container_width=True, hide_index=True)
-                
-                # Statistics
-                st.markdown("---")
-                col1, col2, col3 = st.columns(3)
-                present_count = len([r for r in records if r["status"] == "present"])
-                absent_count = len([r for r in records if r["status"] == "absent"])
-                
-                with col1:
-                    st.metric("✅ Present", present_count)
-                with col2:
-                    st.metric("❌ Absent", absent_count)
-                with col3:
-                    st.metric("📊 Total Days", len(records))
-            else:
-                st.info("No attendance records found")
+            # Statistics
+            st.markdown("---")
+            col1, col2, col3 = st.columns(3)
+            present_count = len([r for r in records if r["status"] == "present"])
+            absent_count = len([r for r in records if r["status"] == "absent"])
+            
+            with col1:
+                st.metric("✅ Present", present_count)
+            with col2:
+                st.metric("❌ Absent", absent_count)
+            with col3:
+                st.metric("📊 Total Days", len(records))
+        else:
+            st.info("No attendance records found")
     
     # =========================================================
     # TAB 4: LEAVE
     # =========================================================
-    with tab4:
+    if section == "📅 Leave":
         st.subheader("📅 Leave Management")
         
         # Leave request form
         with st.expander("📝 Apply for Leave", expanded=False):
             col1, col2 = st.columns(2)
             with col1:
-                leave_type = st.selectbox(
-                    "Leave Type",
-                    ["Sick Leave", "Casual Leave", "Earned Leave", "Maternity Leave", "Other"]
-                )
+                leave_type = st.selectbox("Leave Type", LEAVE_TYPES)
                 start_leave = st.date_input("From Date", key="leave_start")
             
             with col2:
@@ -380,46 +328,46 @@ def show():
             st.write(f"**Duration:** {days} day(s)")
             
             if st.button("📤 Submit Leave Request", use_container_width=True):
-                if leave_requests_col is not None:
-                    leave_requests_col.insert_one({
-                        "employee_id": employee_id,
-                        "leave_type": leave_type,
-                        "start_date": datetime(start_leave.year, start_leave.month, start_leave.day),
-                        "end_date": datetime(end_leave.year, end_leave.month, end_leave.day),
-                        "days": days,
-                        "reason": reason,
-                        "status": "pending",
-                        "applied_on": datetime.now()
-                    })
-                    st.success("✅ Leave request submitted!")
-                    st.rerun()
+                leave_requests_col.insert_one({
+                    "employee_id": employee_id,
+                    "leave_type": leave_type,
+                    "start_date": datetime(start_leave.year, start_leave.month, start_leave.day),
+                    "end_date": datetime(end_leave.year, end_leave.month, end_leave.day),
+                    "days": days,
+                    "reason": reason,
+                    "status": "pending",
+                    "applied_on": datetime.now()
+                })
+                daily_summary.record_leave_applied()
+                metrics.inc("leave_applied")
+                st.success("✅ Leave request submitted!")
+                st.rerun()
         
         st.markdown("---")
         
         # Leave requests history
         st.markdown("### 📋 Leave History")
         
-        if leave_requests_col is not None:
-            leaves = list(leave_requests_col.find({"employee_id": employee_id}).sort("applied_on", -1))
-            
-            if leaves:
-                for leave in leaves:
-                    status_color = "🟢" if leave["status"] == "approved" else "🔴" if leave["status"] == "rejected" else "🟡"
-                    with st.expander(f"{status_color} {leave['leave_type']} - {leave['start_date'].replace(hour=0, minute=0, second=0, microsecond=0)} to {leave['end_date'].replace(hour=0, minute=0, second=0, microsecond=0)}"):
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.write(f"**Status:** {leave['status'].upper()}")
-                            st.write(f"**Days:** {leave['days']}")
-                            st.write(f"**Reason:** {leave['reason']}")
-                        with col2:
-                            st.write(f"**Applied On:** {leave['applied_on'].replace(hour=0, minute=0, second=0, microsecond=0)}")
-            else:
-                st.info("No leave requests found")
+        leaves = list(queries.find("leave_history", {"employee_id": employee_id}, sort=[("applied_on", -1)]))
+        
+        if leaves:
+            for leave in leaves:
+                status_color = "🟢" if leave["status"] == "approved" else "🔴" if leave["status"] == "rejected" else "🟡"
+                with st.expander(f"{status_color} {leave['leave_type']} - {leave['start_date'].replace(hour=0, minute=0, second=0, microsecond=0)} to {leave['end_date'].replace(hour=0, minute=0, second=0, microsecond=0)}"):
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.write(f"**Status:** {leave['status'].upper()}")
+                        st.write(f"**Days:** {leave['days']}")
+                        st.write(f"**Reason:** {leave['reason']}")
+                    with col2:
+                        st.write(f"**Applied On:** {leave['applied_on'].replace(hour=0, minute=0, second=0, microsecond=0)}")
+        else:
+            st.info("No leave requests found")
     
     # =========================================================
     # TAB 5: WORKING HOURS
     # =========================================================
-    with tab5:
+    if section == "⏱️ Working Hours":
         st.subheader("⏱️ Working Hours History")
         
         # Date range filter
@@ -429,50 +377,47 @@ def show():
         with col2:
             wh_end_date = st.date_input("To Date", datetime.now().replace(hour=0, minute=0, second=0, microsecond=0), key="wh_end")
         
-        if working_hours_col is not None:
-            # ✅ FIX: Use datetime.datetime for database queries
-            wh_start_dt = datetime(wh_start_date.year, wh_start_date.month, wh_start_date.day)
-            wh_end_dt = datetime(wh_end_date.year, wh_end_date.month, wh_end_date.day, 23, 59, 59)
+        # ✅ FIX: Use datetime.datetime for database queries
+        wh_start_dt = datetime(wh_start_date.year, wh_start_date.month, wh_start_date.day)
+        wh_end_dt = datetime(wh_end_date.year, wh_end_date.month, wh_end_date.day, 23, 59, 59)
+        
+        records = list(queries.find("working_hours_table", {
+            "employee_id": employee_id,
+            "date": {"$gte": wh_start_dt, "$lte": wh_end_dt}
+        }, sort=[("date", -1)]))
+        
+        if records:
+            df = pd.DataFrame([
+                {
+                    "Date": r["date"].strftime("%Y-%m-%d"),
+                    "Check In": format_time(r.get("check_in")),
+                    "Check Out": format_time(r.get("check_out")),
+                    "Hours": f"{r.get('working_hours', 0):.2f}",
+                    "Status": r.get("status", "-").upper()
+                }
+                for r in records
+            ])
             
-            records = list(working_hours_col.find({
-                "employee_id": employee_id,
-                "date": {"$gte": wh_start_dt, "$lte": wh_end_dt}
-            }).sort("date", -1))
+            st.dataframe(df, use_container_width=True, hide_index=True)
             
-            if records:
-                df = pd.DataFrame([
-                    {
-                        "Date": r["date"].strftime("%Y-%m-%d"),
-                        "Check In": r.get("check_in", "-"),
-                        "Check Out": r.get("check_out", "-"),
-                        "Hours": f"{r.get('working_hours', 0):.2f}",
-                        "Status": r.get("status", "-").upper()
-                    }
-                    for r in records
-                ])
-                
-                st.dataframe(df, use_container_width=True, hide_index=True)
-                
-                # Summary statistics
-                st.markdown("---")
-                st.markdown("### 📊 Summary Statistics")
-                col1, col2, col3, col4 = st.columns(4)
-                
-                total_hours = sum(r.get("working_hours", 0) for r in records)
-                avg_hours = total_hours / len(records) if records else 0
-                checked_out = len([r for r in records if r.get("status") == "checked_out"])
-                days_below_6 = len([r for r in records if r.get("working_hours", 0) < 6])
-                
-                with col1:
-                    st.metric("Total Hours", f"{total_hours:.2f}")
-                with col2:
-                    st.metric("Average/Day", f"{avg_hours:.2f}")
-                with col3:
-                    st.metric("Days Tracked", checked_out)
-                with col4:
-                    st.metric("Below 6hrs", days_below_6)
-            else:
-                st.info("No working hours records found for selected period")
+            # Summary statistics
+            st.markdown("---")
+            st.markdown("### 📊 Summary Statistics")
+            col1, col2, col3, col4 = st.columns(4)
+            
+            # Every row of the range is already here; no second round trip for the totals
+            wh_stats = summarize_hours_records(records)[employee_id]
+            
+            with col1:
+                st.metric("Total Hours", f"{wh_stats['total_hours']:.2f}")
+            with col2:
+                st.metric("Average/Day", f"{wh_stats['avg_hours']:.2f}")
+            with col3:
+                st.metric("Days Tracked", wh_stats["checked_out"])
+            with col4:
+                st.metric(f"Below {MIN_DAILY_HOURS}hrs", wh_stats["below_min"])
+        else:
+            st.info("No working hours records found for selected period")
 
 if __name__ == "__main__":
     show()
\ No newline at end of file
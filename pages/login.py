@@ -10,7 +10,10 @@ from pathlib import Path
 # Add parent directory to path to import modules from root
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from auth import login_user, signup_user
+from session_tokens import create_session
+import metrics
 
+@metrics.timed_page("login")
 def show():
     """Display login/signup interface"""
     st.set_page_config(
@@ -94,6 +97,11 @@ def show():
                             st.session_state.user = result
                             st.session_state.authenticated = True
                             st.session_state.user_role = selected_role
+                            
+                            # Let a page refresh resume this session without a new login
+                            token = create_session(result)
+                            st.session_state.session_token = token
+                            st.session_state.session_cookie = token
                             st.success("✅ Login successful!")
                             st.balloons()
                             st.rerun()
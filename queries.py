@@ -0,0 +1,75 @@
+"""
+View Queries
+Each dashboard view declares the fields it renders and reads through
+projected cursors, so pages never pull whole documents (documents,
+salary_structure, contact, job_details) just to draw a label or a table row
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+from database import get_collection
+
+# View name -> (collection, fields the view renders); "_id" only when listed
+VIEWS = {
+    "employee_directory": ("employees", ["employee_id", "name", "department"]),
+    "employee_summary": ("employees", ["employee_id", "name"]),
+    "employee_profile": ("employees", [
+        "employee_id", "name", "department", "designation", "profile_picture",
+        "contact", "job_details", "salary_structure", "documents"
+    ]),
+    "leave_list": ("leave_requests", [
+        "_id", "employee_id", "leave_type", "start_date", "end_date", "days", "reason", "status"
+    ]),
+    "leave_history": ("leave_requests", [
+        "leave_type", "start_date", "end_date", "days", "reason", "status", "applied_on"
+    ]),
+    "attendance_table": ("attendance", [
+        "employee_id", "date", "status", "check_in", "check_out", "working_hours"
+    ]),
+    "working_hours_table": ("working_hours", [
+        "employee_id", "date", "check_in", "check_out", "working_hours", "status"
+    ])
+}
+
+
+def projection(view: str) -> dict:
+    """Return the MongoDB projection for a view"""
+    _, fields = VIEWS[view]
+    fields_projection = {field: 1 for field in fields}
+    if "_id" not in fields_projection:
+        fields_projection["_id"] = 0
+    return fields_projection
+
+
+def find(view: str, query: dict, sort=None, limit: int = 0, collation=None):
+    """
+    Projected cursor over a view's collection
+
+    Args:
+        view: Key of VIEWS
+        query: MongoDB filter
+        sort: Key or list of (key, direction) pairs, as for Cursor.sort
+        limit: Maximum documents (0 for no limit)
+        collation: pymongo Collation for string comparisons and sort
+
+    Returns:
+        pymongo Cursor yielding only the view's fields
+    """
+    collection, _ = VIEWS[view]
+    cursor = get_collection(collection).find(query, projection(view))
+    if collation:
+        cursor = cursor.collation(collation)
+    if sort:
+        cursor = cursor.sort(sort)
+    if limit:
+        cursor = cursor.limit(limit)
+    return cursor
+
+
+def find_one(view: str, query: dict):
+    """Projected find_one over a view's collection (None if no match)"""
+    collection, _ = VIEWS[view]
+    return get_collection(collection).find_one(query, projection(view))
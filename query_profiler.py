@@ -0,0 +1,174 @@
+"""
+Query Profiler
+Per-rerun MongoDB instrumentation: every command is tagged with the page
+and section that issued it, and round trips, latency, documents returned
+and slow queries are summarised for the admin debug panel and the
+`dayflow.queries` log
+
+pymongo calls command listeners on the thread that runs the operation, and
+Streamlit runs each session's script on its own thread, so the current
+rerun's profile is kept thread-local.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from pymongo import monitoring
+
+# app.py imports this module before database.py, which also loads .env
+load_dotenv()
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+# INFO logs every rerun's summary, WARNING only slow queries
+QUERY_LOG_LEVEL = os.getenv("QUERY_LOG_LEVEL", "INFO").upper()
+# Append to this file instead of stderr (optional)
+QUERY_LOG_FILE = os.getenv("QUERY_LOG_FILE")
+
+logger = logging.getLogger("dayflow.queries")
+if not logger.handlers:
+    _handler = logging.FileHandler(QUERY_LOG_FILE) if QUERY_LOG_FILE else logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(QUERY_LOG_LEVEL)
+    # Streamlit configures its own loggers; keep these lines out of the root logger
+    logger.propagate = False
+_local = threading.local()
+
+
+class RerunProfile:
+    """Commands issued during one script rerun"""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.section = "-"
+        self.started_at = time.perf_counter()
+        self.by_tag = {}
+        self.slow = []
+        self.pending = {}
+
+    def totals(self) -> dict:
+        """Return commands, total ms and documents across all tags"""
+        return {
+            "commands": sum(s["commands"] for s in self.by_tag.values()),
+            "ms": round(sum(s["ms"] for s in self.by_tag.values()), 2),
+            "docs": sum(s["docs"] for s in self.by_tag.values())
+        }
+
+    def summary(self) -> dict:
+        """Return a JSON-serialisable summary of the rerun"""
+        return {
+            "page": self.page,
+            "rerun_ms": round((time.perf_counter() - self.started_at) * 1000, 2),
+            **self.totals(),
+            "by_tag": [
+                {"page": page, "section": section, **stats}
+                for (page, section), stats in self.by_tag.items()
+            ],
+            "slow": self.slow
+        }
+
+
+def _docs_returned(command_name: str, reply: dict) -> int:
+    """Count documents in a command reply"""
+    cursor = reply.get("cursor")
+    if cursor:
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    if command_name in ("count", "distinct"):
+        return 1
+    return 0
+
+
+class _ProfilerListener(monitoring.CommandListener):
+    """Feeds command events into the current thread's RerunProfile"""
+
+    def started(self, event):
+        profile = getattr(_local, "profile", None)
+        if profile is None:
+            return
+        target = event.command.get(event.command_name)
+        profile.pending[event.request_id] = (
+            (profile.page, profile.section),
+            event.command_name,
+            target if isinstance(target, str) else event.database_name
+        )
+
+    def succeeded(self, event):
+        self._finish(event, _docs_returned(event.command_name, event.reply))
+
+    def failed(self, event):
+        self._finish(event, 0)
+
+    def _finish(self, event, docs: int):
+        profile = getattr(_local, "profile", None)
+        if profile is None:
+            return
+        tag, command_name, target = profile.pending.pop(
+            event.request_id, ((profile.page, profile.section), event.command_name, "")
+        )
+        ms = event.duration_micros / 1000
+
+        stats = profile.by_tag.setdefault(tag, {"commands": 0, "ms": 0.0, "docs": 0})
+        stats["commands"] += 1
+        stats["ms"] = round(stats["ms"] + ms, 2)
+        stats["docs"] += docs
+
+        if ms >= SLOW_QUERY_MS:
+            slow = {
+                "page": tag[0],
+                "section": tag[1],
+                "command": command_name,
+                "collection": target,
+                "ms": round(ms, 2),
+                "docs": docs
+            }
+            profile.slow.append(slow)
+            logger.warning("slow query %s", json.dumps(slow))
+
+
+# Applies to every MongoClient created after import (database.get_client is lazy)
+monitoring.register(_ProfilerListener())
+
+
+def begin_rerun(page: str):
+    """Start profiling a rerun on the current thread"""
+    _local.profile = RerunProfile(page)
+
+
+def set_page(page: str, section: str = "-"):
+    """Tag subsequent commands with a page and section"""
+    profile = getattr(_local, "profile", None)
+    if profile is not None:
+        profile.page = page
+        profile.section = section
+
+
+def profile_rerun(fn):
+    """Decorator: profile everything a script entry point does in one rerun"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        begin_rerun("app")
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            end_rerun()
+    return wrapper
+
+
+def current() -> RerunProfile:
+    """Return the current thread's profile (None outside a rerun)"""
+    return getattr(_local, "profile", None)
+
+
+def end_rerun() -> dict:
+    """Finish the rerun, log its summary and return it"""
+    profile = getattr(_local, "profile", None)
+    _local.profile = None
+    if profile is None:
+        return {}
+    summary = profile.summary()
+    logger.info(json.dumps(summary, default=str))
+    return summary
@@ -0,0 +1,215 @@
+"""
+Reports Export Engine
+Streams attendance, working hours and leave data from a batched cursor
+into chunked CSV or Parquet writers. Writing to a file (the CLI) keeps
+memory flat however large the date range or employee set; the Reports
+page download holds the finished export in memory, as Streamlit serves
+downloads from bytes
+Usage: python reports.py attendance --from 2026-01-01 --to 2026-03-31
+                         [--format csv|parquet] [--output FILE]
+                         [--employees EMP001,EMP002] [--department Engineering]
+"""
+
+import argparse
+import csv
+import io
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+from database import get_collection
+import employee_directory
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Report name -> source collection, date field, sort and typed columns
+REPORTS = {
+    "attendance": {
+        "collection": "attendance",
+        "date_field": "date",
+        "sort": [("employee_id", 1), ("date", 1)],
+        "columns": [
+            ("employee_id", "str"),
+            ("name", "str"),
+            ("date", "datetime"),
+            ("status", "str"),
+            ("check_in", "datetime"),
+            ("check_out", "datetime"),
+            ("working_hours", "float")
+        ]
+    },
+    "working_hours": {
+        "collection": "working_hours",
+        "date_field": "date",
+        "sort": [("employee_id", 1), ("date", 1)],
+        "columns": [
+            ("employee_id", "str"),
+            ("name", "str"),
+            ("date", "datetime"),
+            ("check_in", "datetime"),
+            ("check_out", "datetime"),
+            ("working_hours", "float"),
+            ("status", "str")
+        ]
+    },
+    "leave_requests": {
+        "collection": "leave_requests",
+        "date_field": "start_date",
+        "sort": [("_id", 1)],
+        "columns": [
+            ("employee_id", "str"),
+            ("name", "str"),
+            ("leave_type", "str"),
+            ("start_date", "datetime"),
+            ("end_date", "datetime"),
+            ("days", "int"),
+            ("status", "str"),
+            ("reason", "str"),
+            ("applied_on", "datetime")
+        ]
+    }
+}
+
+FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def _convert(value, kind: str):
+    """Coerce a stored value to its report column type (None stays None)"""
+    if value is None:
+        return None
+    if kind == "str":
+        return str(value)
+    if kind == "float":
+        return float(value)
+    if kind == "int":
+        return int(value)
+    return value if isinstance(value, datetime) else None
+
+
+def iter_chunks(report: str, start_dt: datetime, end_dt: datetime, employee_ids: list = None,
+                chunk_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Yield lists of typed row dicts for a report
+
+    Args:
+        report: Key of REPORTS
+        start_dt / end_dt: Inclusive range on the report's date field
+        employee_ids: Restrict to these employees (None for everyone)
+        chunk_size: Rows per chunk and cursor batch size
+    """
+    spec = REPORTS[report]
+    columns = spec["columns"]
+    names = employee_directory.get_names()
+
+    query = {spec["date_field"]: {"$gte": start_dt, "$lte": end_dt}}
+    if employee_ids is not None:
+        query["employee_id"] = {"$in": list(employee_ids)}
+    projection = {field: 1 for field, _ in columns if field != "name"}
+    projection["_id"] = 0
+
+    cursor = (
+        get_collection(spec["collection"])
+        .find(query, projection)
+        .sort(spec["sort"])
+        .batch_size(chunk_size)
+    )
+
+    chunk = []
+    for doc in cursor:
+        doc["name"] = names.get(doc.get("employee_id"))
+        chunk.append({field: _convert(doc.get(field), kind) for field, kind in columns})
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_csv(out, report: str, start_dt: datetime, end_dt: datetime, employee_ids: list = None,
+              chunk_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Stream a report into a text file object as CSV; returns the row count"""
+    fields = [field for field, _ in REPORTS[report]["columns"]]
+    writer = csv.DictWriter(out, fieldnames=fields)
+    writer.writeheader()
+
+    rows = 0
+    for chunk in iter_chunks(report, start_dt, end_dt, employee_ids, chunk_size):
+        writer.writerows(chunk)
+        rows += len(chunk)
+    return rows
+
+
+def write_parquet(out, report: str, start_dt: datetime, end_dt: datetime, employee_ids: list = None,
+                  chunk_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Stream a report into a path or binary file as Parquet, one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"str": pa.string(), "float": pa.float64(), "int": pa.int64(), "datetime": pa.timestamp("ms")}
+    schema = pa.schema([(field, types[kind]) for field, kind in REPORTS[report]["columns"]])
+
+    rows = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in iter_chunks(report, start_dt, end_dt, employee_ids, chunk_size):
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            rows += len(chunk)
+    return rows
+
+
+def export_to_file(report: str, fmt: str, start_dt: datetime, end_dt: datetime, employee_ids: list = None):
+    """
+    Export into memory for st.download_button
+
+    Streamlit reads a download callable's result fully into bytes before
+    serving it, so the whole export is held in memory; use the CLI for
+    exports too large for that.
+
+    Returns:
+        io.BytesIO positioned at the start
+    """
+    out = io.BytesIO()
+    if fmt == "parquet":
+        write_parquet(out, report, start_dt, end_dt, employee_ids)
+    else:
+        text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+        write_csv(text, report, start_dt, end_dt, employee_ids)
+        text.flush()
+        text.detach()
+    out.seek(0)
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a Dayflow report as CSV or Parquet")
+    parser.add_argument("report", choices=list(REPORTS))
+    parser.add_argument("--from", dest="start", required=True, help="start date YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", required=True, help="end date YYYY-MM-DD (inclusive)")
+    parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    parser.add_argument("--output", default=None, help="output file (default: <report>_<from>_<to>.<format>)")
+    parser.add_argument("--employees", default=None, help="comma-separated employee IDs")
+    parser.add_argument("--department", default=None)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    start_dt = datetime.strptime(args.start, "%Y-%m-%d")
+    end_dt = datetime.strptime(args.end, "%Y-%m-%d").replace(hour=23, minute=59, second=59)
+    output = args.output or f"{args.report}_{args.start}_{args.end}.{args.format}"
+
+    employee_ids = None
+    if args.employees:
+        employee_ids = [e.strip() for e in args.employees.split(",") if e.strip()]
+    if args.department:
+        in_department = employee_directory.department_ids(args.department)
+        employee_ids = in_department if employee_ids is None else [e for e in employee_ids if e in in_department]
+
+    started = time.perf_counter()
+    print(f"🔄 Exporting {args.report} {args.start} → {args.end} to {output}...")
+    if args.format == "parquet":
+        count = write_parquet(output, args.report, start_dt, end_dt, employee_ids, args.batch_size)
+    else:
+        with open(output, "w", newline="", encoding="utf-8") as f:
+            count = write_csv(f, args.report, start_dt, end_dt, employee_ids, args.batch_size)
+    print(f"\n✅ {count} rows written in {time.perf_counter() - started:.1f}s\n")
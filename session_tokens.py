@@ -0,0 +1,112 @@
+"""
+Session Resume Tokens
+Signed, expiring tokens stored in a browser cookie so a refreshed page is
+restored with one indexed lookup instead of a new bcrypt login
+
+Tokens have the form "<session_id>.<hmac>". Only a SHA-256 hash of the
+session id is stored in the `sessions` collection, whose `expires_at` TTL
+index (see migrate.py) removes expired sessions.
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+from database import sessions_col
+
+COOKIE_NAME = "dayflow_session"
+SESSION_TTL_HOURS = int(os.getenv("SESSION_TTL_HOURS", "12"))
+
+# Without a configured secret, tokens stay valid only until the process restarts
+SESSION_SECRET = os.getenv("SESSION_SECRET") or secrets.token_hex(32)
+
+# Fields of the user document kept on the session
+SESSION_USER_FIELDS = ("employee_id", "email", "name", "role")
+
+
+def _sign(session_id: str) -> str:
+    return hmac.new(SESSION_SECRET.encode(), session_id.encode(), hashlib.sha256).hexdigest()
+
+
+def _session_key(session_id: str) -> str:
+    return hashlib.sha256(session_id.encode()).hexdigest()
+
+
+def _parse(token: str):
+    """Return the session id of a correctly signed token, else None"""
+    if not token or "." not in token:
+        return None
+    session_id, signature = token.rsplit(".", 1)
+    if not hmac.compare_digest(signature, _sign(session_id)):
+        return None
+    return session_id
+
+
+def create_session(user: dict) -> str:
+    """
+    Start a session for an authenticated user
+
+    Returns:
+        Signed token to store in the browser cookie
+    """
+    session_id = secrets.token_urlsafe(32)
+    # Aware UTC: BSON stores UTC, which is what the TTL index compares against
+    now = datetime.now(timezone.utc)
+    sessions_col.insert_one({
+        "_id": _session_key(session_id),
+        "user": {field: user.get(field) for field in SESSION_USER_FIELDS},
+        "created_at": now,
+        "expires_at": now + timedelta(hours=SESSION_TTL_HOURS)
+    })
+    return f"{session_id}.{_sign(session_id)}"
+
+
+def resume_session(token: str):
+    """
+    Look up the user for a session token
+
+    Returns:
+        The session's user dict, or None if the token is invalid, revoked
+        or expired
+    """
+    session_id = _parse(token)
+    if session_id is None:
+        return None
+
+    session = sessions_col.find_one({
+        "_id": _session_key(session_id),
+        "expires_at": {"$gt": datetime.now(timezone.utc)}
+    })
+    return session["user"] if session else None
+
+
+def revoke_session(token: str):
+    """Delete a session so its token can no longer be resumed"""
+    session_id = _parse(token)
+    if session_id is not None:
+        sessions_col.delete_one({"_id": _session_key(session_id)})
+
+
+def cookie_script(token: str = None) -> str:
+    """
+    Build the script that sets (or, with no token, clears) the session cookie
+
+    Streamlit cannot set cookies from Python; the script runs in a
+    components.html iframe, which shares the app's origin.
+    """
+    if token:
+        value = f"{token}; max-age={SESSION_TTL_HOURS * 3600}"
+    else:
+        value = "; max-age=0"
+    return f"""
+<script>
+const secure = window.parent.location.protocol === "https:" ? "; Secure" : "";
+window.parent.document.cookie = "{COOKIE_NAME}={value}; path=/; SameSite=Strict" + secure;
+</script>
+"""
@@ -0,0 +1,42 @@
+"""
+Analytics Tests
+In-memory working hours summary matches the MongoDB aggregation
+"""
+
+from datetime import datetime, timedelta
+
+import analytics
+from analytics import summarize_hours_records, working_hours_stats_by_employee
+
+DAY = datetime(2026, 9, 1)
+
+RECORDS = [
+    {"employee_id": "EMP002", "date": DAY, "working_hours": 9.5, "status": "checked_out"},
+    {"employee_id": "EMP001", "date": DAY, "working_hours": 8.0, "status": "checked_out"},
+    {"employee_id": "EMP001", "date": DAY + timedelta(days=1), "working_hours": 4.0, "status": "checked_out"},
+    {"employee_id": "EMP001", "date": DAY + timedelta(days=2), "status": "checked_in"},
+]
+
+
+def test_summarize_hours_records():
+    stats = summarize_hours_records(RECORDS)
+    assert list(stats) == ["EMP001", "EMP002"]
+    assert stats["EMP001"] == {
+        "total_hours": 12.0,
+        "avg_hours": 4.0,
+        "days": 3,
+        "checked_out": 2,
+        "below_min": 2
+    }
+    assert stats["EMP002"]["below_min"] == 0
+
+
+def test_summarize_hours_records_empty():
+    assert summarize_hours_records([]) == {}
+
+
+def test_summary_matches_aggregation(db, monkeypatch):
+    db["working_hours"].insert_many([dict(r) for r in RECORDS])
+    monkeypatch.setattr(analytics, "working_hours_col", db["working_hours"])
+    aggregated = working_hours_stats_by_employee(["EMP001", "EMP002"], DAY, DAY + timedelta(days=2))
+    assert aggregated == summarize_hours_records(RECORDS)
@@ -0,0 +1,63 @@
+"""
+Bulk Import Tests
+Per-row validation and the users/employees writes of the CSV import
+"""
+
+import io
+
+import pytest
+
+import bulk_import
+import daily_summary
+
+HEADER = "employee_id,email,name,password,role,basic,hra\n"
+
+
+@pytest.fixture
+def collections(db, monkeypatch):
+    monkeypatch.setattr(bulk_import, "users_col", db["users"])
+    monkeypatch.setattr(bulk_import, "employees_col", db["employees"])
+    monkeypatch.setattr(daily_summary, "rebuild_totals", lambda: None)
+    db["users"].create_index("email", unique=True)
+    db["users"].create_index("employee_id", unique=True)
+    db["employees"].create_index("employee_id", unique=True)
+    return db
+
+
+def run_import(text: str) -> dict:
+    return bulk_import.import_users(io.StringIO(HEADER + text), rounds=4, hash_workers=2)
+
+
+@pytest.mark.parametrize("field, value", [("basic", "50,000"), ("hra", "abc"), ("basic", "nan")])
+def test_validate_rejects_bad_salary(field, value):
+    row = {"employee_id": "E1", "email": "a@co.com", "name": "A", "password": "secret1", field: value}
+    assert bulk_import._validate(row) == f"{field} must be a plain number (e.g. 50000)"
+
+
+def test_validate_accepts_blank_and_decimal_salary():
+    row = {"employee_id": "E1", "email": "a@co.com", "name": "A", "password": "secret1", "basic": "", "hra": "1500.50"}
+    assert bulk_import._validate(row) is None
+
+
+def test_bad_salary_fails_only_its_row(collections):
+    result = run_import(
+        "E1,one@co.com,One,secret1,employee,50000,1000\n"
+        'E2,two@co.com,Two,secret1,employee,"50,000",1000\n'
+        "E3,three@co.com,Three,secret1,admin,,\n"
+    )
+    assert result["failed"] == [(3, "basic must be a plain number (e.g. 50000)")]
+    assert result["users"] == 2 and result["employees"] == 1
+    assert sorted(u["employee_id"] for u in collections["users"].find()) == ["E1", "E3"]
+    assert [e["employee_id"] for e in collections["employees"].find()] == ["E1"]
+
+
+def test_duplicate_profile_removes_the_new_account(collections):
+    collections["employees"].insert_one({"employee_id": "E2"})
+    result = run_import(
+        "E1,one@co.com,One,secret1,employee,1,1\n"
+        "E2,two@co.com,Two,secret1,employee,1,1\n"
+    )
+    assert [n for n, _ in result["failed"]] == [3]
+    assert result["failed"][0][1].endswith("; user account removed")
+    assert result["users"] == 1
+    assert [u["employee_id"] for u in collections["users"].find()] == ["E1"]
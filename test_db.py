@@ -4,14 +4,12 @@ Run this to verify MongoDB connection
 Usage: python test_db.py
 """
 
-from database import db, users_col
+from database import users_col, ping
 
 print("\n🔍 Testing database connection...\n")
 
-if db is not None:
+if ping():
     try:
-        # Test connection
-        db.client.admin.command("ping")
         print("✅ MongoDB connection successful!")
 
         # Count users
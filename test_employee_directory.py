@@ -0,0 +1,87 @@
+"""
+Employee Directory Tests
+Prefix-range query shape and keyset paging of the employee picker search
+"""
+
+import pytest
+
+import employee_directory
+import queries
+from employee_directory import SEARCH_COLLATION, search
+
+EMPLOYEES = [
+    {"employee_id": "EMP001", "name": "John Doe", "department": "Engineering"},
+    {"employee_id": "EMP002", "name": "Jane Smith", "department": "Sales"},
+    {"employee_id": "EMP003", "name": "Joe Bloggs", "department": "Engineering"},
+    {"employee_id": "EMP004", "name": "Ann Lee", "department": "HR"},
+    {"employee_id": "EMP005", "name": "Engel Roth", "department": "Sales"},
+]
+
+
+@pytest.fixture
+def directory(db, monkeypatch):
+    db["employees"].insert_many([dict(e, salary_structure={"basic": 1}) for e in EMPLOYEES])
+    # mongomock has no collations; the real index collation is checked separately
+    collations = []
+
+    def record_collation(cursor, collation):
+        collations.append(collation)
+        return cursor
+
+    monkeypatch.setattr("mongomock.collection.Cursor.collation", record_collation, raising=False)
+    return collations
+
+
+def ids(matches):
+    return [m["employee_id"] for m in matches]
+
+
+def test_query_uses_prefix_ranges_and_collation(monkeypatch):
+    calls = []
+    monkeypatch.setattr(queries, "find", lambda *args, **kwargs: calls.append((args, kwargs)) or [])
+
+    assert search("  jo ", after="EMP001", limit=5) == ([], False)
+
+    (view, query), kwargs = calls[0]
+    assert view == "employee_directory"
+    assert query == {
+        "$or": [{field: {"$gte": "jo", "$lt": "jo\uffff"}} for field in ("employee_id", "name", "department")],
+        "employee_id": {"$gt": "EMP001"}
+    }
+    assert kwargs == {"sort": "employee_id", "limit": 6, "collation": SEARCH_COLLATION}
+
+
+def test_prefix_matches_any_field(directory):
+    matches, has_more = search("Eng")
+    assert ids(matches) == ["EMP001", "EMP003", "EMP005"]
+    assert not has_more
+    assert directory == [SEARCH_COLLATION]
+
+
+def test_projection_returns_directory_fields_only(directory):
+    matches, _ = search("Ann")
+    assert matches == [{"employee_id": "EMP004", "name": "Ann Lee", "department": "HR"}]
+
+
+def test_keyset_paging(directory):
+    first, has_more = search("", limit=2)
+    assert ids(first) == ["EMP001", "EMP002"] and has_more
+
+    second, has_more = search("", after=first[-1]["employee_id"], limit=2)
+    assert ids(second) == ["EMP003", "EMP004"] and has_more
+
+    last, has_more = search("", after=second[-1]["employee_id"], limit=2)
+    assert ids(last) == ["EMP005"] and not has_more
+
+
+def test_paging_keeps_the_term(directory):
+    first, has_more = search("J", limit=2)
+    assert ids(first) == ["EMP001", "EMP002"] and has_more
+
+    rest, has_more = search("J", after="EMP002", limit=2)
+    assert ids(rest) == ["EMP003"] and not has_more
+
+
+def test_department_ids(directory, monkeypatch):
+    monkeypatch.setattr(employee_directory, "_cache", {"loaded_at": 0.0, "employees": None})
+    assert employee_directory.department_ids("Engineering") == ["EMP001", "EMP003"]
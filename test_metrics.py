@@ -0,0 +1,68 @@
+"""
+Metrics Tests
+Prometheus text rendering of counters, histograms and label escaping
+"""
+
+import metrics
+from metrics import Counter, Histogram
+
+
+def test_counter_render():
+    counter = Counter("app_events_total", "Events", ("event",))
+    counter.inc("login")
+    counter.inc("login")
+    counter.inc("check_in", amount=3)
+    assert counter.render() == [
+        "# HELP app_events_total Events",
+        "# TYPE app_events_total counter",
+        'app_events_total{event="check_in"} 3',
+        'app_events_total{event="login"} 2',
+    ]
+
+
+def test_counter_without_labels():
+    counter = Counter("app_total", "Total", ())
+    counter.inc()
+    assert counter.render()[-1] == "app_total 1"
+
+
+def test_label_values_are_escaped():
+    counter = Counter("app_events_total", "Events", ("event",))
+    counter.inc('say "hi"\\\nbye')
+    assert counter.render()[-1] == 'app_events_total{event="say \\"hi\\"\\\\\\nbye"} 1'
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("render_seconds", "Render time", ("page",), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, "admin")
+    assert histogram.render() == [
+        "# HELP render_seconds Render time",
+        "# TYPE render_seconds histogram",
+        'render_seconds_bucket{page="admin",le="0.1"} 2',
+        'render_seconds_bucket{page="admin",le="1.0"} 3',
+        'render_seconds_bucket{page="admin",le="+Inf"} 4',
+        'render_seconds_sum{page="admin"} 2.650000',
+        'render_seconds_count{page="admin"} 4',
+    ]
+
+
+def test_timed_page_records_section(monkeypatch):
+    histogram = Histogram("render_seconds", "Render time", ("page", "section"), (10.0,))
+    monkeypatch.setattr(metrics, "render_seconds", histogram)
+
+    @metrics.timed_page("admin_dashboard")
+    def page():
+        metrics.set_section("Reports")
+
+    page()
+    assert list(histogram.series) == [("admin_dashboard", "Reports")]
+
+
+def test_render_text(monkeypatch):
+    monkeypatch.setattr(metrics, "render_seconds", Histogram("render_seconds", "Render time", ("page",), (1.0,)))
+    monkeypatch.setattr(metrics, "events_total", Counter("events_total", "Events", ("event",)))
+    metrics.inc("login_success")
+    text = metrics.render_text()
+    assert text.endswith('events_total{event="login_success"} 1\n')
+    assert "# TYPE render_seconds histogram\n# HELP events_total Events\n" in text
@@ -0,0 +1,67 @@
+"""
+Migration Tests
+Attendance time string parsing (migration 8) and email normalization (migration 9)
+"""
+
+from datetime import datetime
+
+import pytest
+
+from migrate import attendance_time_update, parse_time_string, _normalize_user_emails
+
+DAY = datetime(2026, 9, 1)
+
+
+@pytest.mark.parametrize("value, expected", [
+    # 12-hour strings written by the demo data
+    ("09:30 AM", datetime(2026, 9, 1, 9, 30)),
+    ("06:00 PM", datetime(2026, 9, 1, 18, 0)),
+    # 12 AM is midnight, 12 PM is noon
+    ("12:10 AM", datetime(2026, 9, 1, 0, 10)),
+    ("12:10 PM", datetime(2026, 9, 1, 12, 10)),
+    # 24-hour hours with a suffix, as written by strftime("%H:%M %p")
+    ("18:05 PM", datetime(2026, 9, 1, 18, 5)),
+    ("00:45 AM", datetime(2026, 9, 1, 0, 45)),
+    ("13:00 PM", datetime(2026, 9, 1, 13, 0)),
+    # No suffix, lowercase suffix and surrounding whitespace
+    ("7:05", datetime(2026, 9, 1, 7, 5)),
+    (" 9:15 pm ", datetime(2026, 9, 1, 21, 15)),
+])
+def test_parse_time_string(value, expected):
+    assert parse_time_string(value, DAY) == expected
+
+
+@pytest.mark.parametrize("value", ["-", "", "late", "25:00 AM", "09:75 AM", "09:30 AM extra"])
+def test_parse_time_string_rejects(value):
+    assert parse_time_string(value, DAY) is None
+
+
+def test_attendance_time_update_keeps_originals():
+    update, unparsed = attendance_time_update({"date": DAY, "check_in": "09:30 AM", "check_out": "soon"})
+    assert update == {
+        "check_in": datetime(2026, 9, 1, 9, 30),
+        "check_in_legacy": "09:30 AM",
+        "check_out": None,
+        "check_out_legacy": "soon"
+    }
+    assert unparsed == ["check_out"]
+
+
+def test_attendance_time_update_skips_datetimes_and_placeholders():
+    update, unparsed = attendance_time_update({"date": DAY, "check_in": datetime(2026, 9, 1, 9), "check_out": "-"})
+    assert update == {"check_out": None, "check_out_legacy": "-"}
+    assert unparsed == []
+
+
+def test_normalize_user_emails(db):
+    db["users"].create_index("email", unique=True)
+    db["users"].insert_many([
+        {"email": "John.Doe@Co.com"},
+        {"email": "taken@co.com"},
+        {"email": "Taken@Co.com"},
+        {"email": "plain@co.com"}
+    ])
+    _normalize_user_emails(db)
+    emails = sorted(u["email"] for u in db["users"].find())
+    # The case-only duplicate is left alone rather than failing the migration
+    assert emails == ["Taken@Co.com", "john.doe@co.com", "plain@co.com", "taken@co.com"]
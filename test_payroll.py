@@ -0,0 +1,101 @@
+"""
+Payroll Tests
+Loss-of-pay day counting and the net pay formula
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import payroll
+from payroll import compute_net_pay, lop_days_by_employee, month_bounds
+
+SEPT_START, SEPT_END = month_bounds("2026-09")
+
+
+def _absences(*rows):
+    return pd.DataFrame(list(rows), columns=["employee_id", "date"])
+
+
+def _leaves(*rows):
+    return pd.DataFrame(list(rows), columns=["employee_id", "start_date", "end_date"])
+
+
+def _lop(absences, leaves) -> dict:
+    result = lop_days_by_employee(absences, leaves, SEPT_START, SEPT_END)
+    return {r["employee_id"]: (r["unpaid_leave_days"], r["lop_days"]) for r in result.to_dict("records")}
+
+
+def test_month_bounds():
+    assert month_bounds("2026-02") == (datetime(2026, 2, 1), datetime(2026, 2, 28))
+    assert month_bounds("2026-12") == (datetime(2026, 12, 1), datetime(2026, 12, 31))
+
+
+def test_absences_inside_unpaid_leave_count_once():
+    # Tue 1 - Thu 3 Sep unpaid, with absences also recorded on 2 and 3 Sep
+    absences = _absences(("E1", datetime(2026, 9, 2)), ("E1", datetime(2026, 9, 3)))
+    leaves = _leaves(("E1", datetime(2026, 9, 1), datetime(2026, 9, 3)))
+    assert _lop(absences, leaves) == {"E1": (3, 3)}
+
+
+def test_absences_outside_leave_add_up():
+    absences = _absences(("E1", datetime(2026, 9, 10)))
+    leaves = _leaves(("E1", datetime(2026, 9, 1), datetime(2026, 9, 3)))
+    assert _lop(absences, leaves) == {"E1": (3, 4)}
+
+
+def test_leave_clipped_to_month_and_weekdays():
+    # 28 Aug - 8 Sep: only 1-4 and 7-8 Sep are September weekdays
+    leaves = _leaves(("E1", datetime(2026, 8, 28), datetime(2026, 9, 8)))
+    assert _lop(_absences(), leaves) == {"E1": (6, 6)}
+
+
+def test_overlapping_leaves_count_once():
+    leaves = _leaves(
+        ("E1", datetime(2026, 9, 1), datetime(2026, 9, 3)),
+        ("E1", datetime(2026, 9, 3), datetime(2026, 9, 4))
+    )
+    assert _lop(_absences(), leaves) == {"E1": (4, 4)}
+
+
+def test_absences_only_and_empty_inputs():
+    assert _lop(_absences(("E2", datetime(2026, 9, 7))), _leaves()) == {"E2": (0, 1)}
+    assert lop_days_by_employee(_absences(), _leaves(), SEPT_START, SEPT_END).empty
+
+
+def test_compute_net_pay():
+    frame = pd.DataFrame([
+        {"basic": 30000.0, "hra": 10000.0, "allowances": 4000.0, "deductions": 2000.0, "lop_days": 0},
+        {"basic": 30000.0, "hra": 10000.0, "allowances": 4000.0, "deductions": 2000.0, "lop_days": 2},
+        {"basic": 30000.0, "hra": 10000.0, "allowances": 4000.0, "deductions": 2000.0, "lop_days": 40},
+    ])
+    result = compute_net_pay(frame, working_days=22)
+
+    assert list(result["gross"]) == [44000.0, 44000.0, 44000.0]
+    assert list(result["loss_of_pay"]) == [0.0, 4000.0, 44000.0]
+    # LOP days are capped at the month's working days and net pay never goes negative
+    assert list(result["lop_days"]) == [0, 2, 22]
+    assert list(result["net_pay"]) == [42000.0, 38000.0, 0.0]
+
+
+def test_compute_net_pay_rounds_to_paise():
+    frame = pd.DataFrame([{"basic": 10000.0, "hra": 0.0, "allowances": 0.0, "deductions": 0.0, "lop_days": 1}])
+    result = compute_net_pay(frame, working_days=21)
+    assert result["loss_of_pay"].iloc[0] == pytest.approx(476.19)
+    assert result["net_pay"].iloc[0] == pytest.approx(9523.81)
+
+
+def test_unpaid_leave_from_the_form_is_deducted(db, monkeypatch):
+    from pages.employee_dashboard import LEAVE_TYPES
+
+    monkeypatch.setattr(payroll, "leave_requests_col", db["leave_requests"])
+    start, end = month_bounds("2026-03")
+    db["leave_requests"].insert_many([
+        {"employee_id": "EMP001", "leave_type": leave_type, "status": "approved",
+         "start_date": datetime(2026, 3, 2), "end_date": datetime(2026, 3, 3)}
+        for leave_type in LEAVE_TYPES
+    ])
+
+    leaves = payroll.load_unpaid_leaves(start, end)
+    assert list(leaves["leave_type"]) == ["Unpaid Leave"]
@@ -0,0 +1,27 @@
+"""
+Query Profiler Tests
+The per-rerun summary reaches the `dayflow.queries` log
+"""
+
+import json
+import logging
+
+import query_profiler
+
+
+def test_logger_is_configured():
+    assert query_profiler.logger.handlers
+    assert query_profiler.logger.getEffectiveLevel() <= logging.INFO
+
+
+def test_rerun_summary_is_logged(caplog):
+    query_profiler.logger.addHandler(caplog.handler)
+    try:
+        query_profiler.profile_rerun(lambda: None)()
+    finally:
+        query_profiler.logger.removeHandler(caplog.handler)
+
+    [record] = [r for r in caplog.records if r.name == "dayflow.queries"]
+    assert record.levelno == logging.INFO
+    summary = json.loads(record.getMessage())
+    assert summary["commands"] == 0 and summary["by_tag"] == []
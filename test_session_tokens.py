@@ -0,0 +1,42 @@
+"""
+Session Token Tests
+Signing, expiry and revocation of session resume tokens
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import session_tokens
+
+USER = {"employee_id": "EMP001", "email": "john@dayflow.com", "name": "John", "role": "employee", "password": b"x"}
+
+
+@pytest.fixture
+def sessions(db, monkeypatch):
+    monkeypatch.setattr(session_tokens, "sessions_col", db["sessions"])
+    return db["sessions"]
+
+
+def test_resume_returns_session_user(sessions):
+    token = session_tokens.create_session(USER)
+    user = session_tokens.resume_session(token)
+    assert user == {"employee_id": "EMP001", "email": "john@dayflow.com", "name": "John", "role": "employee"}
+
+
+def test_tampered_token_is_rejected(sessions):
+    token = session_tokens.create_session(USER)
+    assert session_tokens.resume_session(token[:-1] + ("0" if token[-1] != "0" else "1")) is None
+    assert session_tokens.resume_session("not-a-token") is None
+
+
+def test_expired_session_is_rejected(sessions):
+    token = session_tokens.create_session(USER)
+    sessions.update_many({}, {"$set": {"expires_at": datetime.now(timezone.utc) - timedelta(minutes=1)}})
+    assert session_tokens.resume_session(token) is None
+
+
+def test_revoked_session_is_rejected(sessions):
+    token = session_tokens.create_session(USER)
+    session_tokens.revoke_session(token)
+    assert session_tokens.resume_session(token) is None